@@ -2,15 +2,37 @@ import os
 import sys
 import json
 import re
-from collections import Counter
+from collections import Counter, defaultdict
 from werkzeug.utils import secure_filename
-from flask import Flask, render_template, request, redirect, url_for, flash, session, send_from_directory, Response, jsonify
+from flask import Flask, render_template, request, redirect, url_for, flash, session, send_from_directory, Response, jsonify, get_template_attribute
 from datetime import datetime
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import uuid
 import time
 import secrets
 import logging
+import atexit
+import bisect
+import itertools
+import mmap
+import hashlib
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
+from contextlib import contextmanager
+from urllib.parse import unquote
+
+try:
+    import orjson
+except ImportError:  # optional speedup; fall back to the stdlib json module
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # optional; without it cache metadata is read with a full parse
+    ijson = None
 
 # Add the dev directory to Python path to import AnkiDataManager
 sys.path.append(os.path.join(os.path.dirname(__file__), 'dev'))
@@ -22,10 +44,443 @@ try:
 except ImportError:
     import database 
 
+def load_json_file(file_path):
+    """Parse a UTF-8 JSON file, using orjson when it is installed."""
+    if orjson is not None:
+        with open(file_path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def parse_json_response(response):
+    """Decode a JSON HTTP response body, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+def read_text_file(file_path):
+    """
+    Read a UTF-8 text file with universal newlines, like open(...).read().
+    The file is memory-mapped and decoded straight from the mapping, so no
+    intermediate bytes copy of a large novel is held alongside the str.
+    """
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return ''
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            text = str(mm, 'utf-8')
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+def dump_json_file(data, file_path, indent=True):
+    """Write data to a UTF-8 JSON file, using orjson when it is installed."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        with open(file_path, 'wb') as f:
+            f.write(orjson.dumps(data, option=option))
+    else:
+        with open(file_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2 if indent else None)
+
+def dumps_json(data):
+    """Serialize data to a JSON string, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+    return json.dumps(data, ensure_ascii=False)
+
+def load_cache_metadata(file_path):
+    """
+    Read only the 'metadata' object of an Anki vocabulary cache file.
+    With ijson installed the file is stream-parsed and reading stops once the
+    metadata has been yielded, so the 'cards' mapping is never materialized.
+    """
+    if ijson is not None:
+        with open(file_path, 'rb') as f:
+            try:
+                for metadata in ijson.items(f, 'metadata', use_float=True):
+                    return metadata
+            except ijson.JSONError as exc:
+                raise ValueError(f"Invalid JSON in {file_path}: {exc}") from exc
+        raise KeyError('metadata')
+    return load_json_file(file_path)['metadata']
+
+class ProgressTracker(dict):
+    """
+    progress_id -> progress payload. Every assignment or removal notifies
+    waiting SSE streams, so they only wake up when something changed.
+    Finished entries ('complete' or 'error') left untouched for
+    PROGRESS_TTL_SECONDS (a closed tab never opens the results page that
+    removes them) are dropped whenever a new progress_id is added, so
+    finished results cannot pile up in memory. Running analyses are kept
+    however long a single stage takes.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.changed = threading.Condition()
+        self.updated_at = {}
+
+    def __setitem__(self, key, value):
+        with self.changed:
+            if key not in self:
+                self._drop_expired()
+            super().__setitem__(key, value)
+            self.updated_at[key] = time.monotonic()
+            self.changed.notify_all()
+
+    def __delitem__(self, key):
+        with self.changed:
+            super().__delitem__(key)
+            self.updated_at.pop(key, None)
+            self.changed.notify_all()
+
+    def _drop_expired(self):
+        cutoff = time.monotonic() - PROGRESS_TTL_SECONDS
+        expired = [
+            key for key, updated in self.updated_at.items()
+            if updated < cutoff and self[key].get('stage') in ('complete', 'error')
+        ]
+        for key in expired:
+            super().__delitem__(key)
+            del self.updated_at[key]
+            progress_last_update.pop(key, None)
+        if expired:
+            self.changed.notify_all()
+
+    def wait_for_update(self, key, last, timeout):
+        """
+        Block until the payload for key is no longer the object last (or timeout).
+        Returns the current payload, or None once key has been removed.
+        """
+        with self.changed:
+            self.changed.wait_for(lambda: self.get(key) is not last, timeout)
+            return self.get(key)
+
 # Global variables for frequency-based matching
 frequency_cache = None
-progress_tracker = {}
+frequency_cache_dirty = set()
+frequency_cache_lock = threading.Lock()
+frequency_cache_save_lock = threading.Lock()  # one writer of frequency_cache.json at a time
+progress_tracker = ProgressTracker()
+progress_last_update = {}
+ignored_words_state = {'words': None, 'sorted': None, 'dirty': False, 'flush_timer': None}
+ignored_words_lock = threading.RLock()
+cache_metadata = {}  # cache filename -> (mtime_ns, metadata dict)
+cache_index = {'dir_mtime_ns': None, 'by_key': {}}  # cache key -> get_available_caches entry
+vocabulary_set_cache = {}  # cache file path -> (mtime_ns, frozenset of expressions)
+yomitan_health_cache = {'ts': 0, 'result': None}
 active_yomitan_operations = 0
+active_yomitan_operations_lock = threading.Lock()
+
+# Allowed novel file extensions
+ALLOWED_EXTENSIONS = frozenset({'txt', 'md', 'epub'})
+
+# Cover image extensions, in order of preference when several exist
+COVER_EXTENSIONS = ('jpg', 'jpeg', 'png', 'gif', 'bmp', 'webp')
+
+def allowed_file(filename):
+    return '.' in filename and filename.rpartition('.')[2].lower() in ALLOWED_EXTENSIONS
+
+# Kana and CJK ideographs; tokens without any of these never need a Yomitan lookup
+_JP_RE = re.compile(r'[\u3040-\u30ff\u3400-\u9fff\uf900-\ufaff]')
+
+# Markup tags in novel text (EPUB/HTML exports)
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+# Filename segment of a /file_records/<filename> referrer
+_FILE_RECORDS_RE = re.compile(r'/file_records/([^/?]+)')
+
+def strip_html_tags(text):
+    """Remove HTML tags; plain text without any '<' is returned as-is, uncopied."""
+    if '<' not in text:
+        return text
+    return _HTML_TAG_RE.sub('', text)
+
+# Star ratings by frequency rank: rank <= 1500 is 5 stars, <= 5000 is 4, ...
+_STAR_THRESHOLDS = (1500, 5000, 15000, 30000, 60000)
+_STARS = (5, 4, 3, 2, 1, 0)
+
+def rank_to_stars(rank):
+    """Convert frequency rank to star rating (0-5)"""
+    if rank is None:
+        return 0
+    return _STARS[bisect.bisect_left(_STAR_THRESHOLDS, rank)]
+
+def number_format_filter(value):
+    """Format numbers with thousand separators"""
+    # Fast path for the common case of an actual int (no exception setup)
+    if type(value) is int:
+        return f"{value:,}"
+    try:
+        return "{:,}".format(int(value))
+    except (ValueError, TypeError):
+        return value
+
+# Data and novel storage directories - one level above the app folder
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
+NOVEL_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "novels")
+
+# App data files stored alongside the vocabulary caches
+NON_CACHE_FILES = frozenset({'ignored_words.json', 'frequency_cache.json', 'scan_history.db'})
+
+def get_frequency_cache_file():
+    """Get the path to the persisted frequency cache JSON file."""
+    return os.path.join(DATA_DIR, "frequency_cache.json")
+
+def get_ignored_words_file():
+    """Get the path to the ignored words JSON file."""
+    return os.path.join(DATA_DIR, "ignored_words.json")
+
+def get_ignored_words_log_file():
+    """Get the path to the append-only log of ignored word changes."""
+    return os.path.join(DATA_DIR, "ignored_words.log")
+
+def get_token_cache_dir():
+    """Get the directory holding cached tokenization results."""
+    return os.path.join(DATA_DIR, "token_cache")
+
+# Delay before unsaved ignored-word changes are written to the JSON snapshot
+IGNORED_WORDS_FLUSH_SECONDS = 30
+# Upper bound on words per batched frequency request, to keep payloads small
+YOMITAN_BATCH_MAX_WORDS = 500
+# Minimum seconds between intermediate progress_tracker updates from hot loops
+PROGRESS_UPDATE_INTERVAL = 0.05
+# Seconds after its last update that an abandoned progress entry is discarded
+PROGRESS_TTL_SECONDS = 600
+# Idle seconds before an SSE progress stream sends a keep-alive comment
+SSE_KEEPALIVE_SECONDS = 15
+# How long a Yomitan health check result is reused while idle
+YOMITAN_HEALTH_TTL = 2.0
+# Number of tokenized texts kept on disk; least recently used are evicted first
+TOKEN_CACHE_MAX_FILES = 50
+# Concurrent file deletions when clearing all vocabulary caches
+CACHE_DELETE_WORKERS = 16
+# Word cards rendered per list on the cached analysis page; the rest are fetched on demand
+WORD_LIST_PAGE_SIZE = 200
+
+def progress_update_due(progress_id):
+    """
+    Return True if an intermediate progress update for progress_id may be written now.
+    Hot loops call this before formatting their message; stage changes and final
+    updates are written unconditionally.
+    """
+    now = time.monotonic()
+    if now - progress_last_update.get(progress_id, 0.0) < PROGRESS_UPDATE_INTERVAL:
+        return False
+    progress_last_update[progress_id] = now
+    return True
+
+def _frequency_cache_result(cached_data):
+    """Build a lookup result from a frequency cache entry."""
+    if not cached_data.get('found'):
+        return {'found': False}
+    return {
+        'rank': cached_data['rank'],
+        'source': cached_data['source'],
+        'found': True
+    }
+
+def _split_words_into_batches(words, max_chars, max_words=None):
+    """
+    Group words into batches whose newline-joined text stays within max_chars
+    (and, if given, holds at most max_words words).
+    A single word longer than max_chars gets a batch of its own.
+    """
+    batches = []
+    batch = []
+    batch_len = 0
+
+    for word in words:
+        added_len = len(word) + (1 if batch else 0)
+        if batch and (batch_len + added_len > max_chars or len(batch) == max_words):
+            batches.append(batch)
+            batch = []
+            batch_len = 0
+            added_len = len(word)
+        batch.append(word)
+        batch_len += added_len
+
+    if batch:
+        batches.append(batch)
+
+    return batches
+
+def _iter_headwords(option):
+    """Yield headword dicts from a tokenize segment option (flat or nested lists)."""
+    for headword in option.get('headwords') or []:
+        if isinstance(headword, list):
+            for item in headword:
+                if isinstance(item, dict):
+                    yield item
+        elif isinstance(headword, dict):
+            yield headword
+
+# Chunk break characters by priority: sentence endings, other punctuation, whitespace
+_CHUNK_BREAK_TIERS = (
+    ('。', '！', '？', '…', '』', '」'),
+    ('、', '・', '）', '｝'),
+    ('\n', ' ', '　'),  # 　 is full-width space
+)
+
+def _iter_chunk_bounds(text, chunk_size):
+    """
+    Yield (start, end) offsets of text chunks, trying to break at natural boundaries.
+    Prioritizes sentence endings, then punctuation, then whitespace.
+    Only offsets are produced, so callers can slice each chunk when they need it.
+    """
+    start = 0
+
+    while start < len(text):
+        end = start + chunk_size
+
+        if end >= len(text):
+            # Last chunk
+            yield start, len(text)
+            return
+
+        # Try to find a good break point within the last 200 characters
+        search_start = max(start, end - 200)
+
+        # Break after the last boundary of the highest tier found in the window
+        for tier in _CHUNK_BREAK_TIERS:
+            break_pos = max(text.rfind(punct, search_start, end) for punct in tier)
+            if break_pos != -1:
+                end = break_pos + 1
+                break
+
+        yield start, end
+        start = end
+
+def _split_text_into_chunks(text, chunk_size):
+    """Split text into chunks at natural boundaries (see _iter_chunk_bounds)."""
+    if len(text) <= chunk_size:
+        return [text]
+
+    return [text[start:end] for start, end in _iter_chunk_bounds(text, chunk_size)]
+
+# Common Japanese i-adjectives that should NOT be split by the fallback tokenizer
+_COMMON_I_ADJECTIVES = frozenset({
+    '熱い', '冷たい', '暖かい', '涼しい', '温かい',  # Temperature
+    '固い', '柔らかい', '硬い', '軟らかい',           # Texture
+    '重い', '軽い', '厚い', '薄い', '太い', '細い',    # Physical properties  
+    '高い', '低い', '長い', '短い', '広い', '狭い',    # Size/dimension
+    '新しい', '古い', '若い', '美しい', '可愛い',      # Age/beauty
+    '大きい', '小さい', '多い', '少ない',            # Quantity
+    '早い', '遅い', '速い', '安い', '高い',          # Speed/cost
+    '良い', '悪い', '正しい', '間違い', '危ない',      # Quality/safety
+    '楽しい', '悲しい', '嬉しい', '苦しい', '痛い',    # Emotions/sensations
+    '難しい', '易しい', '忙しい', '暇い',            # Difficulty/business
+    '面白い', '詰まらない', '珍しい', '普通い',        # Interest
+    '眠い', '疲れい', '元気い', '健康い'             # Health/energy
+})
+
+# First character -> adjectives starting with it, longest first
+_ADJ_BY_FIRST = defaultdict(list)
+for _adj in sorted(_COMMON_I_ADJECTIVES, key=len, reverse=True):
+    _ADJ_BY_FIRST[_adj[0]].append(_adj)
+_ADJ_BY_FIRST = {first: tuple(adjs) for first, adjs in _ADJ_BY_FIRST.items()}
+del _adj
+
+def _simple_japanese_tokenize(text):
+    """
+    Simple Japanese tokenization fallback that preserves common adjectives.
+    This is a basic approach to avoid over-splitting i-adjectives.
+    """
+    if not text or len(text) == 0:
+        return []
+
+    tokens = []
+    i = 0
+    while i < len(text):
+        char = text[i]
+
+        # Check for multi-character adjectives first
+        for adj in _ADJ_BY_FIRST.get(char, ()):
+            if text.startswith(adj, i):
+                tokens.append(adj)
+                i += len(adj)
+                break
+        else:
+            # Single character fallback
+            if char.strip():  # Skip whitespace
+                tokens.append(char)
+            i += 1
+
+    return tokens
+
+# Token filters used by filter_japanese_tokens, compiled once at import
+_PUNCT_ONLY_RE = re.compile(r'^[。、！？「」『』（）・…ー～〜♡♥★☆◇◆■□▪▫●○◎▲△▼▽◀▶▲▼←→↑↓♪♫※\s\-\u2000-\u206F\u2E00-\u2E7F\u3000-\u303F\uFF00-\uFFEF]+$')
+_SYMBOL_RE = re.compile(r'[♡♥★☆◇◆■□▪▫●○◎▲△▼▽◀▶▲▼←→↑↓♪♫※。、！？「」『』（）・…ー～〜\s\-\u2000-\u206F\u2E00-\u2E7F\u3000-\u303F\uFF00-\uFFEF]')
+_CONJ_TAIL_RE = re.compile(r'^[っつくぐすむぶぬたるれ]{1,2}$')
+
+_SKIP_SINGLE_CHARS = frozenset('はをにがでとやかのもてだよねなをれしたっつくぐすむぶぬ')
+# Don't skip い (adjective ending) and other important single characters
+_IMPORTANT_SINGLE_HIRA = frozenset({'い', 'う', 'き', 'く', 'し', 'す', 'つ', 'ぬ', 'ふ', 'む', 'ゆ', 'る'})
+# Common complete words allowed among very short hiragana tokens
+_ALLOWED_SHORT_HIRA = frozenset({'です', 'ます', 'この', 'その', 'あの', 'どの', 'これ', 'それ',
+                                 'あれ', 'どれ', 'から', 'まで', 'より', 'など', 'でも', 'もう',
+                                 'まだ', 'もの', 'こと', 'とき', 'ため', 'ごと', 'けど'})
+
+# Plain code point range checks; cheaper than a regex for single characters
+def _is_hira(c):
+    return 0x3040 <= ord(c) <= 0x309F
+
+def _is_kata(c):
+    return 0x30A0 <= ord(c) <= 0x30FF
+
+def _is_japanese_char(c):
+    """Hiragana, katakana or CJK unified ideograph."""
+    o = ord(c)
+    return 0x3040 <= o <= 0x30FF or 0x4E00 <= o <= 0x9FAF
+
+def _is_wanted_token(word):
+    """Decide whether a single Yomitan token survives filter_japanese_tokens."""
+    # Skip empty or whitespace-only tokens
+    if not word or not word.strip():
+        return False
+
+    # Skip pure punctuation, symbols, and decorative characters
+    if _PUNCT_ONLY_RE.match(word):
+        return False
+
+    # Skip tokens that are mostly decorative symbols/punctuation
+    symbol_count = len(_SYMBOL_RE.findall(word))
+    if symbol_count >= len(word) * 0.7:  # If 70% or more are symbols/punctuation
+        return False
+
+    # Skip single character particles and auxiliary verbs
+    if len(word) == 1 and word in _SKIP_SINGLE_CHARS:
+        return False
+
+    # Skip single hiragana characters (usually fragments) - but preserve important ones
+    if len(word) == 1 and _is_hira(word):
+        if word not in _IMPORTANT_SINGLE_HIRA:
+            return False
+
+    # Skip single katakana characters (usually fragments) 
+    if len(word) == 1 and _is_kata(word):
+        return False
+
+    # Skip very short hiragana fragments (likely incomplete words)
+    if len(word) <= 2 and all(_is_hira(c) for c in word):
+        if word not in _ALLOWED_SHORT_HIRA:
+            return False
+
+    # Skip fragments that are just conjugation endings
+    if _CONJ_TAIL_RE.match(word):
+        return False
+
+    # Include word if it contains Japanese content OR is non-Japanese text that passed all checks
+    return any(_is_japanese_char(c) for c in word) or not all(_is_japanese_char(c) for c in word)
+
+def filter_japanese_tokens(words):
+    """
+    Comprehensive filtering for Japanese tokens to remove junk.
+    Applied to Yomitan API results.
+    """
+    # A novel repeats the same tokens many times; decide once per distinct token
+    wanted = {word: _is_wanted_token(word) for word in set(words)}
+    return [word for word in words if wanted[word]]
 
 def create_app(test_config=None):
     app = Flask(__name__, instance_relative_config=True)
@@ -38,6 +493,8 @@ def create_app(test_config=None):
         YOMITAN_API_URL=os.environ.get("YOMITAN_API_URL", "http://127.0.0.1:19633").rstrip("/"),
         YOMITAN_API_TIMEOUT=float(os.environ.get("YOMITAN_API_TIMEOUT", "100")),
         YOMITAN_CHUNK_SIZE=int(os.environ.get("YOMITAN_CHUNK_SIZE", "300")),
+        YOMITAN_MAX_WORKERS=int(os.environ.get("YOMITAN_MAX_WORKERS", "16")),
+        YOMITAN_TOKENIZE_WORKERS=int(os.environ.get("YOMITAN_TOKENIZE_WORKERS", "8")),
         ANKI_CONNECT_URL=os.environ.get("ANKI_CONNECT_URL", "http://127.0.0.1:8765").rstrip("/"),
     )
 
@@ -46,32 +503,10 @@ def create_app(test_config=None):
     app.logger.setLevel(logging.DEBUG if app.config.get("DEBUG") else logging.INFO)
     
     # Add number formatting filter
-    @app.template_filter('number_format')
-    def number_format_filter(value):
-        """Format numbers with thousand separators"""
-        try:
-            return "{:,}".format(int(value))
-        except (ValueError, TypeError):
-            return value
-
-    # Add star rating filter
-    @app.template_filter('star_from_rank')
-    def star_from_rank_filter(rank):
-        """Convert frequency rank to star rating (0-5)"""
-        if rank is None:
-            return 0
-        elif rank <= 1500:
-            return 5
-        elif rank <= 5000:
-            return 4
-        elif rank <= 15000:
-            return 3
-        elif rank <= 30000:
-            return 2
-        elif rank <= 60000:
-            return 1
-        else:
-            return 0
+    app.add_template_filter(number_format_filter, 'number_format')
+
+    # Add star rating filter (shared rank -> stars table, no wrapper call)
+    app.add_template_filter(rank_to_stars, 'star_from_rank')
 
     if test_config is None:
         app.config.from_pyfile('config.py', silent=True)
@@ -84,51 +519,228 @@ def create_app(test_config=None):
         pass
 
     # Initialize AnkiDataManager - cache directory one level above the app folder
-    cache_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
-    anki_manager = AnkiDataManager(cache_dir=cache_dir)
+    anki_manager = AnkiDataManager(cache_dir=DATA_DIR)
     
     # Novel storage directory - one level above the app folder
-    novel_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "novels")
+    novel_dir = NOVEL_DIR
     os.makedirs(novel_dir, exist_ok=True)
     
-    # Allowed file extensions
-    ALLOWED_EXTENSIONS = {'txt', 'md', 'epub'}
-
-    def allowed_file(filename):
-        return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
     def get_available_caches():
-        """Get all available cached vocabularies"""
+        """
+        Get all available cached vocabularies.
+        Parsed metadata is kept per file and reused while the file's mtime is
+        unchanged, so unchanged caches cost one stat instead of a full parse.
+        """
         caches = []
-        if os.path.exists(anki_manager.cache_dir):
-            for file in os.listdir(anki_manager.cache_dir):
-                if file.endswith('.json'):
-                    try:
-                        file_path = os.path.join(anki_manager.cache_dir, file)
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            data = json.load(f)
-                            caches.append({
-                                'filename': file,
-                                'note_type': data['metadata'].get('note_type', 'Unknown'),
-                                'field_name': data['metadata'].get('field_name', 'Unknown'),
-                                'last_updated': data['metadata'].get('last_updated', 'Never'),
-                                'total_cards': data['metadata'].get('total_cards', 0),
-                                'key': f"{data['metadata'].get('note_type', 'Unknown')}_{data['metadata'].get('field_name', 'Unknown')}"
-                            })
-                    except (OSError, json.JSONDecodeError, KeyError, TypeError) as exc:
-                        app.logger.warning("Skipping invalid cache file %s: %s", file, exc)
+        if not os.path.exists(anki_manager.cache_dir):
+            return caches
+
+        with os.scandir(anki_manager.cache_dir) as entries:
+            for entry in entries:
+                file = entry.name
+                if not file.endswith('.json') or file in NON_CACHE_FILES:
+                    continue
+                try:
+                    mtime = entry.stat().st_mtime_ns
+                    cached = cache_metadata.get(file)
+                    if cached and cached[0] == mtime:
+                        metadata = cached[1]
+                    else:
+                        metadata = load_cache_metadata(entry.path)
+                        cache_metadata[file] = (mtime, metadata)
+
+                    caches.append({
+                        'filename': file,
+                        'note_type': metadata.get('note_type', 'Unknown'),
+                        'field_name': metadata.get('field_name', 'Unknown'),
+                        'last_updated': metadata.get('last_updated', 'Never'),
+                        'total_cards': metadata.get('total_cards', 0),
+                        'key': f"{metadata.get('note_type', 'Unknown')}_{metadata.get('field_name', 'Unknown')}"
+                    })
+                except (OSError, ValueError, KeyError, TypeError, AttributeError) as exc:
+                    app.logger.warning("Skipping invalid cache file %s: %s", file, exc)
         return caches
 
+    def load_vocabulary_set(cache_filename):
+        """
+        Get the set of card expressions in a vocabulary cache file (by filename
+        within the cache directory). The set is kept per file and reused while
+        the file's mtime is unchanged, so repeated analyses against the same
+        deck skip the parse and rebuild.
+        """
+        cache_file_path = os.path.join(anki_manager.cache_dir, cache_filename)
+        mtime = os.stat(cache_file_path).st_mtime_ns
+        cached = vocabulary_set_cache.get(cache_file_path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+
+        cache_data = load_json_file(cache_file_path)
+        vocabulary_set = frozenset(
+            expr for expr in (card_data['expression'].strip() for card_data in cache_data['cards'].values())
+            if expr
+        )
+        vocabulary_set_cache[cache_file_path] = (mtime, vocabulary_set)
+        return vocabulary_set
+
+    def find_cache_by_key(cache_key):
+        """
+        Look up one available cache by its key without re-enumerating the cache
+        directory. The key index is rebuilt when the directory mtime changes
+        (a cache was added or removed) or the selected file has been rewritten.
+        """
+        try:
+            dir_mtime = os.stat(anki_manager.cache_dir).st_mtime_ns
+        except OSError:
+            return None
+
+        if cache_index['dir_mtime_ns'] == dir_mtime:
+            selected_cache = cache_index['by_key'].get(cache_key)
+            if selected_cache is None:
+                return None
+
+            cached = cache_metadata.get(selected_cache['filename'])
+            try:
+                cache_path = os.path.join(anki_manager.cache_dir, selected_cache['filename'])
+                unchanged = cached is not None and cached[0] == os.stat(cache_path).st_mtime_ns
+            except OSError:
+                unchanged = False
+            if unchanged:
+                return selected_cache
+
+        cache_index['by_key'] = {cache['key']: cache for cache in get_available_caches()}
+        cache_index['dir_mtime_ns'] = dir_mtime
+        return cache_index['by_key'].get(cache_key)
+
     # Yomitan / Anki API configuration (from app.config)
     YOMITAN_API_URL = app.config["YOMITAN_API_URL"]
     YOMITAN_API_TIMEOUT = app.config["YOMITAN_API_TIMEOUT"]
     YOMITAN_CHUNK_SIZE = app.config["YOMITAN_CHUNK_SIZE"]
+    YOMITAN_MAX_WORKERS = app.config["YOMITAN_MAX_WORKERS"]
+    YOMITAN_TOKENIZE_WORKERS = app.config["YOMITAN_TOKENIZE_WORKERS"]
     ANKI_CONNECT_URL = app.config["ANKI_CONNECT_URL"]
+    YOMITAN_TERM_ENTRIES_URL = f"{YOMITAN_API_URL}/termEntries"
+    YOMITAN_TOKENIZE_URL = f"{YOMITAN_API_URL}/tokenize"
+
+    # Keep-alive connection pools shared by all Yomitan / Anki requests
+    yomitan_session = requests.Session()
+    yomitan_session.headers['Connection'] = 'keep-alive'
+    # One host, so one pool; sized so every lookup and tokenize worker can hold
+    # a kept-alive connection at once instead of opening and discarding extras
+    yomitan_adapter = HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=YOMITAN_MAX_WORKERS + YOMITAN_TOKENIZE_WORKERS,
+        max_retries=0
+    )
+    yomitan_session.mount("http://", yomitan_adapter)
+    yomitan_session.mount("https://", yomitan_adapter)
+
+    # Health polling only needs a couple of connections; never retry, so a
+    # failing Anki Connect is reported within the request timeout
+    anki_session = requests.Session()
+    anki_session.headers['Connection'] = 'keep-alive'
+    anki_adapter = HTTPAdapter(pool_connections=1, pool_maxsize=2, max_retries=Retry(total=0, connect=0))
+    anki_session.mount("http://", anki_adapter)
+    anki_session.mount("https://", anki_adapter)
+
+    # Long-lived worker threads for tokenize requests (text chunks and frequency
+    # batches), shared across analyses so concurrent scans stay within the limit
+    yomitan_pool = ThreadPoolExecutor(max_workers=YOMITAN_TOKENIZE_WORKERS, thread_name_prefix='yomitan')
+    atexit.register(yomitan_pool.shutdown, wait=False, cancel_futures=True)
+
+    # Scan history and frequency cache writes happen after the results are
+    # handed to the user; one writer is enough since SQLite serializes them anyway
+    scan_save_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='scan-save')
+    atexit.register(scan_save_pool.shutdown, wait=True)
+
+    @app.teardown_appcontext
+    def close_db_connection(exception=None):
+        """Close the request thread's SQLite connection; the thread will not be reused."""
+        database.close_db_connection()
+
+    def save_scan_in_background(analysis, text_content, filename):
+        """Persist a finished analysis to scan history without delaying the caller."""
+        def save():
+            try:
+                database.save_scan_result(
+                    analysis_data=analysis,
+                    text_content=text_content,
+                    filename=filename
+                )
+            except Exception:
+                app.logger.exception("Failed to persist scan result for %s", filename)
+        scan_save_pool.submit(save)
+
+    @contextmanager
+    def yomitan_operation():
+        """Count an in-flight Yomitan operation so health checks can see the load."""
+        global active_yomitan_operations
+        with active_yomitan_operations_lock:
+            active_yomitan_operations += 1
+        try:
+            yield
+        finally:
+            # Always decrement counter, even on error
+            with active_yomitan_operations_lock:
+                active_yomitan_operations = max(0, active_yomitan_operations - 1)
 
     # ============================================
     # MULTI-DICTIONARY FREQUENCY SYSTEM
     # ============================================
     
+    def _yomitan_freq_raw(word):
+        """
+        Query Yomitan termEntries for the best (lowest) frequency rank of a word.
+        Request errors and non-200 responses raise, so the caller leaves the
+        word out of the frequency cache and it is retried on the next call.
+        
+        Returns:
+            tuple: (rank, source), or (None, None) if the word has no frequency data
+        """
+        # Make API request to yomitan - but only look for exact matches
+        response = yomitan_session.post(
+            YOMITAN_TERM_ENTRIES_URL,
+            json={"term": word},
+            timeout=YOMITAN_API_TIMEOUT
+        )
+        response.raise_for_status()
+        
+        data = parse_json_response(response)
+        
+        # Parse the response to extract frequency information
+        if not data or 'dictionaryEntries' not in data:
+            return None, None
+        
+        # Look for frequency information ONLY for the exact word match
+        best_rank = None
+        best_source = None
+        
+        for entry in data['dictionaryEntries']:
+            # Only process entries that match the exact input word
+            if 'headwords' in entry and entry['headwords']:
+                exact_match_found = False
+                for headword in entry['headwords']:
+                    if 'term' in headword and headword['term'] == word:
+                        exact_match_found = True
+                        break
+                    if 'reading' in headword and headword['reading'] == word:
+                        exact_match_found = True
+                        break
+                
+                # Only get frequency data if this entry is for the exact word
+                if exact_match_found and 'frequencies' in entry and entry['frequencies']:
+                    for freq_item in entry['frequencies']:
+                        if isinstance(freq_item, dict) and 'frequency' in freq_item:
+                            rank = freq_item['frequency']
+                            source = freq_item.get('dictionary', 'Unknown')
+                            
+                            # Use the best (lowest) rank found
+                            if best_rank is None or rank < best_rank:
+                                best_rank = rank
+                                best_source = source
+        
+        return best_rank, best_source
+
     def get_yomitan_frequency_data(word):
         """
         Get frequency data for a word using one-to-one matching only.
@@ -142,87 +754,212 @@ def create_app(test_config=None):
                   {'rank': int, 'source': str, 'found': bool}
                   or {'found': False} if not found
         """
-        global frequency_cache
+        # Persisted and batch-fetched results (hits and misses) live in the frequency cache
+        cached_data = frequency_cache.get(word)
+        if cached_data is not None:
+            return _frequency_cache_result(cached_data)
         
         try:
-            # Check if word is already cached
-            if frequency_cache and word in frequency_cache:
-                cached_data = frequency_cache[word]
-                return {
-                    'rank': cached_data['rank'],
-                    'source': cached_data['source'],
-                    'found': True
-                }
-            
-            # Make API request to yomitan - but only look for exact matches
-            response = requests.post(
-                f"{YOMITAN_API_URL}/termEntries", 
-                json={"term": word},
-                timeout=YOMITAN_API_TIMEOUT
-            )
-            
-            if response.status_code != 200:
-                return {'found': False}
-            
-            data = response.json()
-            
-            # Parse the response to extract frequency information
-            if not data or 'dictionaryEntries' not in data:
-                return {'found': False}
-            
-            # Look for frequency information ONLY for the exact word match
-            best_rank = None
-            best_source = None
-            
-            for entry in data['dictionaryEntries']:
-                # Only process entries that match the exact input word
-                if 'headwords' in entry and entry['headwords']:
-                    exact_match_found = False
-                    for headword in entry['headwords']:
-                        if 'term' in headword and headword['term'] == word:
-                            exact_match_found = True
-                            break
-                        if 'reading' in headword and headword['reading'] == word:
-                            exact_match_found = True
-                            break
-                    
-                    # Only get frequency data if this entry is for the exact word
-                    if exact_match_found and 'frequencies' in entry and entry['frequencies']:
-                        for freq_item in entry['frequencies']:
-                            if isinstance(freq_item, dict) and 'frequency' in freq_item:
-                                rank = freq_item['frequency']
-                                source = freq_item.get('dictionary', 'Unknown')
-                                
-                                # Use the best (lowest) rank found
-                                if best_rank is None or rank < best_rank:
-                                    best_rank = rank
-                                    best_source = source
-            
-            if best_rank is not None:
-                # Cache the result
-                if frequency_cache is None:
-                    frequency_cache = {}
-                
-                frequency_cache[word] = {
-                    'rank': best_rank,
-                    'source': best_source,
-                    'found': True
-                }
-                
-                return {
-                    'rank': best_rank,
-                    'source': best_source,
-                    'found': True
-                }
-            
-            return {'found': False}
-            
+            rank, source = _yomitan_freq_raw(word)
         except requests.exceptions.RequestException as e:
-            print(f"Yomitan API request failed for word '{word}': {e}")
+            app.logger.warning("Yomitan API request failed for word %r: %s", word, e)
             return {'found': False}
-        except Exception as e:
-            print(f"Error processing yomitan data for word '{word}': {e}")
+        except Exception:
+            app.logger.warning("Error processing yomitan data for word %r", word, exc_info=True)
+            return {'found': False}
+        
+        # Cache the result so it is persisted with the rest
+        store_frequency_data(word, rank, source)
+
+        if rank is None:
             return {'found': False}
+        
+        return {
+            'rank': rank,
+            'source': source,
+            'found': True
+        }
+
+    def _tokenize_frequency_batch(words):
+        """
+        Look up frequency data for a batch of words with one /tokenize request.
+
+        Each word is sent on its own line; segments whose text equals an input
+        word and carry frequency information for an exact headword match are
+        resolved. Words the response cannot answer are left out of the result
+        so the caller can fall back to single-word lookups.
+
+        Returns:
+            dict: word -> (rank, source), with (None, None) for words Yomitan
+                  resolved but has no frequency data for
+        """
+        wanted = set(words)
+        resolved = {}
+
+        response = yomitan_session.post(
+            YOMITAN_TOKENIZE_URL,
+            json={"text": "\n".join(words), "scanLength": max(len(word) for word in words)},
+            timeout=YOMITAN_API_TIMEOUT
+        )
+
+        if response.status_code != 200:
+            return resolved
+
+        result = parse_json_response(response)
+        if not isinstance(result, list):
+            return resolved
+
+        for response_item in result:
+            if not isinstance(response_item, dict):
+                continue
+
+            for segment in response_item.get('content') or []:
+                if not isinstance(segment, list):
+                    continue
+
+                options = [option for option in segment if isinstance(option, dict)]
+                word = ''.join(option.get('text', '') for option in options)
+                if word not in wanted:
+                    continue
+
+                has_frequency_info = False
+                best_rank = None
+                best_source = None
+
+                for option in options:
+                    headwords = list(_iter_headwords(option))
+                    frequencies = []
+
+                    for index, headword in enumerate(headwords):
+                        if headword.get('term') != word and headword.get('reading') != word:
+                            continue
+                        if 'frequencies' in headword:
+                            has_frequency_info = True
+                            frequencies.extend(headword['frequencies'] or [])
+                        # Option-level frequencies reference headwords by index
+                        for freq_item in option.get('frequencies') or []:
+                            if isinstance(freq_item, dict) and freq_item.get('headwordIndex') == index:
+                                has_frequency_info = True
+                                frequencies.append(freq_item)
+
+                    for freq_item in frequencies:
+                        if isinstance(freq_item, dict) and 'frequency' in freq_item:
+                            rank = freq_item['frequency']
+                            if best_rank is None or rank < best_rank:
+                                best_rank = rank
+                                best_source = freq_item.get('dictionary', 'Unknown')
+
+                if has_frequency_info and resolved.get(word, (None, None))[0] is None:
+                    resolved[word] = (best_rank, best_source)
+
+        return resolved
+
+    def get_yomitan_frequency_data_batch(words, progress=None):
+        """
+        Get frequency data for many words using batched Yomitan requests.
+        Cached words are answered locally; the rest are sent in batches of up to
+        YOMITAN_CHUNK_SIZE characters (and YOMITAN_BATCH_MAX_WORDS words), several
+        batches in flight at once, and anything a batch cannot resolve falls
+        back to get_yomitan_frequency_data.
+
+        Args:
+            words: Iterable of exact words to look up
+            progress: Optional callable(done, total), called as words needing a
+                Yomitan lookup are resolved
+
+        Returns:
+            dict: word -> frequency data (same structure as get_yomitan_frequency_data)
+        """
+        results = {}
+        pending = []
+
+        for word in dict.fromkeys(words):
+            cached_data = frequency_cache.get(word)
+            if cached_data is not None:
+                results[word] = _frequency_cache_result(cached_data)
+            elif not _JP_RE.search(word):
+                # Punctuation, numerals and Latin text have no frequency entries
+                results[word] = {'found': False}
+            else:
+                pending.append(word)
+
+        batches = _split_words_into_batches(pending, YOMITAN_CHUNK_SIZE, YOMITAN_BATCH_MAX_WORDS)
+        resolved_count = 0
+        if batches:
+            with yomitan_operation():
+                futures = {yomitan_pool.submit(_tokenize_frequency_batch, batch): batch for batch in batches}
+                for future in as_completed(futures):
+                    batch = futures[future]
+                    try:
+                        resolved = future.result()
+                    except requests.exceptions.RequestException as e:
+                        app.logger.warning("Yomitan batch frequency request failed for %d words: %s", len(batch), e)
+                        continue
+                    except Exception:
+                        app.logger.warning("Error processing yomitan batch frequency data for %d words", len(batch), exc_info=True)
+                        continue
+
+                    for word, (rank, source) in resolved.items():
+                        store_frequency_data(word, rank, source)
+                        if rank is None:
+                            results[word] = {'found': False}
+                            continue
+
+                        results[word] = {
+                            'rank': rank,
+                            'source': source,
+                            'found': True
+                        }
+
+                    resolved_count += len(resolved)
+                    if progress:
+                        progress(resolved_count, len(pending))
+
+        # Words the batched responses could not answer use single-word lookups
+        unresolved = [word for word in pending if word not in results]
+        fallback_progress = None
+        if progress:
+            def fallback_progress(done, total):
+                progress(len(pending) - len(unresolved) + done, len(pending))
+        results.update(get_yomitan_frequency_data_many(unresolved, progress=fallback_progress))
+
+        return results
+
+    def get_yomitan_frequency_data_many(words, progress=None):
+        """
+        Get frequency data for many words with concurrent single-word lookups.
+        Each termEntries request is independent and IO-bound, so uncached words
+        are spread over a pool of up to YOMITAN_MAX_WORKERS threads.
+
+        Args:
+            words: Iterable of exact words to look up
+            progress: Optional callable(done, total), called as uncached words
+                are looked up
+
+        Returns:
+            dict: word -> frequency data (same structure as get_yomitan_frequency_data)
+        """
+        results = {}
+        missing = []
+
+        for word in dict.fromkeys(words):
+            cached_data = frequency_cache.get(word)
+            if cached_data is not None:
+                results[word] = _frequency_cache_result(cached_data)
+            else:
+                missing.append(word)
+
+        if not missing:
+            return results
+
+        with yomitan_operation():
+            with ThreadPoolExecutor(max_workers=min(YOMITAN_MAX_WORKERS, len(missing))) as executor:
+                for done, (word, data) in enumerate(zip(missing, executor.map(get_yomitan_frequency_data, missing)), 1):
+                    results[word] = data
+                    if progress:
+                        progress(done, len(missing))
+
+        return results
 
     def get_yomitan_vocabulary_match(word, vocabulary_set):
         """
@@ -244,9 +981,17 @@ def create_app(test_config=None):
                     'original_word': word
                 }
             
+            # Non-Japanese tokens cannot resolve to another dictionary form
+            if not _JP_RE.search(word):
+                return {
+                    'found': False,
+                    'matched_form': None,
+                    'original_word': word
+                }
+            
             # Query yomitan for dictionary entries
-            response = requests.post(
-                f"{YOMITAN_API_URL}/termEntries", 
+            response = yomitan_session.post(
+                YOMITAN_TERM_ENTRIES_URL,
                 json={"term": word},
                 timeout=YOMITAN_API_TIMEOUT
             )
@@ -258,7 +1003,7 @@ def create_app(test_config=None):
                     'original_word': word
                 }
             
-            data = response.json()
+            data = parse_json_response(response)
             
             if not data:
                 return {
@@ -318,67 +1063,104 @@ def create_app(test_config=None):
             }
             
         except requests.exceptions.RequestException as e:
-            print(f"Yomitan vocabulary API request failed for word '{word}': {e}")
+            app.logger.warning("Yomitan vocabulary API request failed for word %r: %s", word, e)
             return {
                 'found': False,
                 'matched_form': None,
                 'original_word': word
             }
-        except Exception as e:
-            print(f"Error processing yomitan vocabulary data for word '{word}': {e}")
+        except Exception:
+            app.logger.warning("Error processing yomitan vocabulary data for word %r", word, exc_info=True)
             return {
                 'found': False,
                 'matched_form': None,
                 'original_word': word
             }
     
-    def get_star_rating_ranges():
-        """
-        Define star rating ranges based on frequency ranks.
-        This uses a generalized approach suitable for most frequency dictionaries.
-        
-        Returns:
-            dict: Star level -> (min_rank, max_rank) mapping
-        """
-        return {
-            5: (1, 1500),      # Most common words
-            4: (1501, 5000),   # Very common words  
-            3: (5001, 15000),  # Common words
-            2: (15001, 30000), # Moderately common words
-            1: (30001, 60000), # Less common words
-            0: (60001, float('inf'))  # Rare words
-        }
-    
     def load_frequency_data():
         """
         Initialize frequency cache for yomitan API-based lookups.
-        This doesn't pre-load data but sets up the caching system.
+        Entries persisted by earlier runs are loaded from disk on first use;
+        new lookups are added on demand.
         
         Returns:
-            dict: Empty cache that will be populated on demand
+            dict: word -> {'rank': int, 'source': str, 'found': True},
+                  or {'found': False} for words Yomitan has no frequency for
         """
         global frequency_cache
         if frequency_cache is None:
             frequency_cache = {}
+            cache_file = get_frequency_cache_file()
+            try:
+                if os.path.exists(cache_file):
+                    data = load_json_file(cache_file)
+                    frequency_cache.update(data.get('frequencies', {}))
+            except (OSError, ValueError, AttributeError) as exc:
+                app.logger.warning("Ignoring unreadable frequency cache %s: %s", cache_file, exc)
         
         return frequency_cache
+
+    def store_frequency_data(word, rank, source):
+        """
+        Add a lookup result to the frequency cache and mark it for saving.
+        A rank of None records a miss so the word is not looked up again.
+        """
+        with frequency_cache_lock:
+            if rank is None:
+                frequency_cache[word] = {'found': False}
+            else:
+                frequency_cache[word] = {
+                    'rank': rank,
+                    'source': source,
+                    'found': True
+                }
+            frequency_cache_dirty.add(word)
+
+    def save_frequency_data():
+        """Write the frequency cache to disk if it has unsaved entries."""
+        if not frequency_cache_dirty or frequency_cache is None:
+            return True
+
+        cache_file = get_frequency_cache_file()
+        # A background save and the exit save must not write an older snapshot last
+        with frequency_cache_save_lock:
+            # Snapshot under the lock so lookup threads can keep adding entries
+            with frequency_cache_lock:
+                data = {
+                    'frequencies': dict(frequency_cache),
+                    'last_updated': datetime.now().isoformat()
+                }
+                saved_words = set(frequency_cache_dirty)
+                frequency_cache_dirty.clear()
+
+            try:
+                os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+                tmp_file = f"{cache_file}.tmp"
+                dump_json_file(data, tmp_file, indent=False)
+                os.replace(tmp_file, cache_file)
+                return True
+            except (OSError, TypeError, ValueError) as exc:
+                app.logger.warning("Failed to save frequency cache %s: %s", cache_file, exc)
+                with frequency_cache_lock:
+                    frequency_cache_dirty.update(saved_words)
+                return False
+
+    # Initialize once; lookups below read the global cache directly
+    load_frequency_data()
+    atexit.register(save_frequency_data)
     
-    def get_word_star_rating(word, frequency_data=None):
+    def get_word_star_rating(word):
         """
         Calculate star rating for a word using yomitan API frequency data.
         
         Args:
             word: The word to rate
-            frequency_data: Frequency cache (will initialize if None)
             
         Returns:
             dict: Rating info with structure:
                   {'stars': int, 'rank': int, 'source': str}
                   or {'stars': 0} if word not found
         """
-        if frequency_data is None:
-            frequency_data = load_frequency_data()
-        
         # Get frequency data from yomitan API
         freq_result = get_yomitan_frequency_data(word)
         
@@ -386,47 +1168,63 @@ def create_app(test_config=None):
             return {'stars': 0, 'rank': None, 'source': None}
         
         rank = freq_result['rank']
-        source = freq_result['source']
-        star_ranges = get_star_rating_ranges()
-        
-        # Calculate stars using the defined ranges
-        stars = 0
-        for star_level in sorted(star_ranges.keys(), reverse=True):
-            min_rank, max_rank = star_ranges[star_level]
-            if min_rank <= rank <= max_rank:
-                stars = star_level
-                break
         
         return {
-            'stars': stars,
+            'stars': rank_to_stars(rank),
             'rank': rank,
-            'source': source
+            'source': freq_result['source']
         }
 
-    def calculate_vocabulary_star_statistics(known_words, frequency_data=None):
+    def get_word_star_ratings_bulk(words):
+        """
+        Calculate star ratings for many words with one batched frequency lookup.
+
+        Args:
+            words: Iterable of words to rate
+
+        Returns:
+            dict: word -> rating info (same structure as get_word_star_rating)
+        """
+        ratings = {}
+
+        for word, freq_result in get_yomitan_frequency_data_batch(words).items():
+            if not freq_result.get('found'):
+                ratings[word] = {'stars': 0, 'rank': None, 'source': None}
+                continue
+
+            rank = freq_result['rank']
+            ratings[word] = {
+                'stars': rank_to_stars(rank),
+                'rank': rank,
+                'source': freq_result['source']
+            }
+
+        return ratings
+
+    def calculate_vocabulary_star_statistics(known_words):
         """
         Calculate star rating statistics for vocabulary analysis.
         
         Args:
             known_words: List of known word dictionaries from vocabulary analysis
-            frequency_data: Frequency dictionary (will load if None)
             
         Returns:
             dict: Statistics including star distribution and average rating
         """
-        if frequency_data is None:
-            frequency_data = load_frequency_data()
-        
         # Count words by star rating
         star_counts = {5: 0, 4: 0, 3: 0, 2: 0, 1: 0, 0: 0}
         total_word_instances = 0  # Count by frequency of occurrence
         total_star_score = 0
-        
+
+        # Rate each distinct word once up front so the loop below only reads results
+        unique_words = {word_info['word'] for word_info in known_words}
+        ratings = get_word_star_ratings_bulk(unique_words)
+
         for word_info in known_words:
             word = word_info['word']
             count = word_info['count']  # How many times this word appears
-            
-            rating_info = get_word_star_rating(word, frequency_data)
+
+            rating_info = ratings[word]
             stars = rating_info['stars']
             source = rating_info.get('source', 'Unknown')
             
@@ -464,43 +1262,28 @@ def create_app(test_config=None):
         Returns:
             dict: Statistics including star distribution and average rating
         """
-        # Count words by star rating
-        star_counts = {5: 0, 4: 0, 3: 0, 2: 0, 1: 0, 0: 0}
-        total_word_instances = 0  # Count by frequency of occurrence
-        total_star_score = 0
+        # Bin words by star rating: unique words and occurrences per star level
+        unique_per_star = [0] * 6
+        instances_per_star = [0] * 6
         words_with_frequency = 0
         
         for word_info in all_words:
-            word = word_info['word']
-            count = word_info['count']  # How many times this word appears
-            has_frequency = word_info['has_frequency']
             rank = word_info.get('rank')
-            
-            if has_frequency and rank is not None:
-                # Convert rank to star rating
-                if rank <= 1500:
-                    stars = 5
-                elif rank <= 5000:
-                    stars = 4
-                elif rank <= 15000:
-                    stars = 3
-                elif rank <= 30000:
-                    stars = 2
-                elif rank <= 60000:
-                    stars = 1
-                else:
-                    stars = 0
-                
+            if word_info['has_frequency'] and rank is not None:
+                stars = rank_to_stars(rank)
                 words_with_frequency += 1
             else:
                 # No frequency data available
                 stars = 0
             
-            star_counts[stars] += 1  # Count unique words
-            
-            # Weight by occurrence frequency for average calculation
-            total_word_instances += count
-            total_star_score += stars * count
+            unique_per_star[stars] += 1
+            instances_per_star[stars] += word_info['count']
+        
+        star_counts = {stars: unique_per_star[stars] for stars in (5, 4, 3, 2, 1, 0)}
+        
+        # Weight by occurrence frequency for average calculation
+        total_word_instances = sum(instances_per_star)
+        total_star_score = sum(stars * instances for stars, instances in enumerate(instances_per_star))
         
         # Calculate average star rating (weighted by word frequency)
         avg_stars = total_star_score / total_word_instances if total_word_instances > 0 else 0
@@ -533,67 +1316,40 @@ def create_app(test_config=None):
         Returns:
             dict: Statistics including star distribution by category
         """
-        def get_star_rating_from_rank(rank):
-            """Convert frequency rank to star rating"""
-            if rank is None:
-                return 0
-            elif rank <= 1500:
-                return 5
-            elif rank <= 5000:
-                return 4
-            elif rank <= 15000:
-                return 3
-            elif rank <= 30000:
-                return 2
-            elif rank <= 60000:
-                return 1
-            else:
-                return 0
-        
-        # Initialize counters for each category
-        categories = {
-            'known': {'star_counts': {5: 0, 4: 0, 3: 0, 2: 0, 1: 0, 0: 0}, 'total_instances': 0, 'total_score': 0},
-            'ignored': {'star_counts': {5: 0, 4: 0, 3: 0, 2: 0, 1: 0, 0: 0}, 'total_instances': 0, 'total_score': 0},
-            'unknown': {'star_counts': {5: 0, 4: 0, 3: 0, 2: 0, 1: 0, 0: 0}, 'total_instances': 0, 'total_score': 0}
-        }
-        
-        # Process each category
-        for category_name, word_list in [('known', known_words), ('ignored', ignored_words), ('unknown', unknown_words)]:
-            category_data = categories[category_name]
-            
-            for word_info in word_list:
-                count = word_info['count']
-                rank = word_info.get('rank')
-                stars = get_star_rating_from_rank(rank)
-                
-                category_data['star_counts'][stars] += 1
-                category_data['total_instances'] += count
-                category_data['total_score'] += stars * count
-        
-        # Calculate averages and create final structure
         result = {
             'categories': {},
             'combined_star_distribution': {5: 0, 4: 0, 3: 0, 2: 0, 1: 0, 0: 0},
             'total_unique_words': 0,
             'total_word_instances': 0
         }
+        combined_counts = result['combined_star_distribution']
         
-        for category_name, data in categories.items():
-            avg_rating = data['total_score'] / data['total_instances'] if data['total_instances'] > 0 else 0
-            unique_count = sum(data['star_counts'].values())
+        # Single pass per category, accumulating combined totals inline
+        for category_name, word_list in (('known', known_words), ('ignored', ignored_words), ('unknown', unknown_words)):
+            star_counts = {5: 0, 4: 0, 3: 0, 2: 0, 1: 0, 0: 0}
+            total_instances = 0
+            total_score = 0
+            
+            for word_info in word_list:
+                count = word_info['count']
+                stars = rank_to_stars(word_info.get('rank'))
+                
+                star_counts[stars] += 1
+                combined_counts[stars] += 1
+                total_instances += count
+                total_score += stars * count
+            
+            avg_rating = total_score / total_instances if total_instances > 0 else 0
+            unique_count = len(word_list)
             
             result['categories'][category_name] = {
-                'star_counts': data['star_counts'],
+                'star_counts': star_counts,
                 'unique_words': unique_count,
-                'total_instances': data['total_instances'],
+                'total_instances': total_instances,
                 'average_rating': round(avg_rating, 2)
             }
-            
-            # Add to combined totals
-            for star in range(6):
-                result['combined_star_distribution'][star] += data['star_counts'][star]
             result['total_unique_words'] += unique_count
-            result['total_word_instances'] += data['total_instances']
+            result['total_word_instances'] += total_instances
         
         # Add star breakdown with labels and colors
         result['star_breakdown'] = {
@@ -611,22 +1367,54 @@ def create_app(test_config=None):
     # IGNORED WORDS MANAGEMENT
     # ============================================
     
-    def get_ignored_words_file():
-        """Get the path to the ignored words JSON file."""
-        return os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "ignored_words.json")
-    
+
     def load_ignored_words():
-        """Load the list of words that users have chosen to ignore."""
-        ignored_file = get_ignored_words_file()
-        try:
-            if os.path.exists(ignored_file):
-                with open(ignored_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    return set(data.get('ignored_words', []))
-            return set()
-        except Exception as e:
-            print(f"Error loading ignored words: {e}")
-            return set()
+        """
+        Load the set of words that users have chosen to ignore.
+        The set is read once (JSON snapshot plus any changes still in the log)
+        and then kept in memory as the authoritative copy, so callers must not
+        mutate it except through add_ignored_word/remove_ignored_word.
+        """
+        with ignored_words_lock:
+            if ignored_words_state['words'] is not None:
+                return ignored_words_state['words']
+
+            ignored_words = set()
+            try:
+                ignored_file = get_ignored_words_file()
+                if os.path.exists(ignored_file):
+                    data = load_json_file(ignored_file)
+                    ignored_words = set(data.get('ignored_words', []))
+            except Exception:
+                # Keep going with what the log can restore; returning an uncached
+                # set here would let changes land in a copy nobody else sees
+                app.logger.warning("Error loading ignored words", exc_info=True)
+                ignored_words = set()
+
+            # Replay changes made since the last snapshot was written
+            log_file = get_ignored_words_log_file()
+            replayed = False
+            try:
+                if os.path.exists(log_file):
+                    with open(log_file, 'r', encoding='utf-8') as f:
+                        for line in f:
+                            try:
+                                change = json.loads(line)
+                            except ValueError:
+                                continue  # partially written line
+                            if change.get('op') == 'add':
+                                ignored_words.add(change['word'])
+                            elif change.get('op') == 'remove':
+                                ignored_words.discard(change['word'])
+                            replayed = True
+            except (OSError, KeyError, AttributeError) as e:
+                app.logger.warning("Error replaying ignored words log: %s", e)
+
+            ignored_words_state['words'] = ignored_words
+            if replayed:
+                ignored_words_state['dirty'] = True
+                _schedule_ignored_words_flush()
+            return ignored_words
     
     def save_ignored_words(ignored_words_set):
         """Save the set of ignored words to JSON file."""
@@ -636,35 +1424,105 @@ def create_app(test_config=None):
                 'ignored_words': list(ignored_words_set),
                 'last_updated': datetime.now().isoformat()
             }
-            with open(ignored_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            dump_json_file(data, ignored_file)
             return True
-        except Exception as e:
-            print(f"Error saving ignored words: {e}")
+        except Exception:
+            app.logger.warning("Error saving ignored words", exc_info=True)
             return False
+
+    def flush_ignored_words():
+        """Rewrite ignored_words.json from memory and truncate the change log."""
+        with ignored_words_lock:
+            ignored_words_state['flush_timer'] = None
+            if not ignored_words_state['dirty'] or ignored_words_state['words'] is None:
+                return True
+
+            if not save_ignored_words(ignored_words_state['words']):
+                return False
+
+            try:
+                open(get_ignored_words_log_file(), 'w', encoding='utf-8').close()
+            except OSError as e:
+                # The snapshot is already current; replaying the log again is harmless
+                app.logger.warning("Error truncating ignored words log: %s", e)
+            ignored_words_state['dirty'] = False
+            return True
+
+    def _schedule_ignored_words_flush():
+        """Start the delayed snapshot write unless one is already pending."""
+        if ignored_words_state['flush_timer'] is None:
+            timer = threading.Timer(IGNORED_WORDS_FLUSH_SECONDS, flush_ignored_words)
+            timer.daemon = True
+            ignored_words_state['flush_timer'] = timer
+            timer.start()
+
+    def _log_ignored_word_change(op, word):
+        """Apply an add/remove to the in-memory set and append it to the log."""
+        with ignored_words_lock:
+            ignored_words = load_ignored_words()
+            if (word in ignored_words) == (op == 'add'):
+                return True  # Nothing to change
+
+            try:
+                with open(get_ignored_words_log_file(), 'a', encoding='utf-8') as f:
+                    f.write(json.dumps({'op': op, 'word': word}, ensure_ascii=False) + '\n')
+            except OSError as e:
+                app.logger.warning("Error saving ignored word change: %s", e)
+                return False
+
+            if op == 'add':
+                ignored_words.add(word)
+            else:
+                ignored_words.discard(word)
+            ignored_words_state['sorted'] = None
+            ignored_words_state['dirty'] = True
+            _schedule_ignored_words_flush()
+            return True
+    
+    def get_sorted_ignored_words():
+        """Ignored words in sorted order; the list is rebuilt only after a change."""
+        with ignored_words_lock:
+            ignored_words = load_ignored_words()
+            if ignored_words is not ignored_words_state['words']:
+                return sorted(ignored_words)  # load failed; nothing to cache
+            if ignored_words_state['sorted'] is None:
+                ignored_words_state['sorted'] = sorted(ignored_words)
+            return ignored_words_state['sorted']
     
     def add_ignored_word(word):
         """Add a word to the ignored list."""
-        ignored_words = load_ignored_words()
-        ignored_words.add(word)
-        return save_ignored_words(ignored_words)
+        return _log_ignored_word_change('add', word)
     
     def remove_ignored_word(word):
         """Remove a word from the ignored list."""
-        ignored_words = load_ignored_words()
-        ignored_words.discard(word)
-        return save_ignored_words(ignored_words)
+        return _log_ignored_word_change('remove', word)
+
+    atexit.register(flush_ignored_words)
     
     def is_word_ignored(word):
         """Check if a word is in the ignored list."""
-        ignored_words = load_ignored_words()
-        return word in ignored_words
+        return word in load_ignored_words()
+
 
-    def check_yomitan_health():
+    def check_yomitan_health(force=False):
         """
         Simple ping check to see if Yomitan API server is responding.
+        Results are reused for YOMITAN_HEALTH_TTL seconds while no Yomitan
+        operation is running; pass force=True to always probe.
         Returns (is_healthy, status_message, response_time)
         """
+        cached_result = yomitan_health_cache['result']
+        if (not force and cached_result is not None and active_yomitan_operations == 0
+                and time.time() - yomitan_health_cache['ts'] < YOMITAN_HEALTH_TTL):
+            return cached_result
+
+        result = _probe_yomitan_health()
+        yomitan_health_cache['ts'] = time.time()
+        yomitan_health_cache['result'] = result
+        return result
+
+    def _probe_yomitan_health():
+        """Send the health check request. Returns (is_healthy, status_message, response_time)"""
         start_time = time.time()
         
         # Determine appropriate timeout based on system activity
@@ -678,7 +1536,7 @@ def create_app(test_config=None):
         
         try:
             # Simple GET request to see if server is alive - don't test functionality
-            response = requests.get(f"{YOMITAN_API_URL}/", timeout=base_timeout)
+            response = yomitan_session.get(f"{YOMITAN_API_URL}/", timeout=base_timeout)
             response_time = round((time.time() - start_time) * 1000, 1)
             
             # Any response means server is running
@@ -701,7 +1559,6 @@ def create_app(test_config=None):
     
     def test_yomitan_tokenization(extended_timeout=False):
         """Test actual tokenization functionality including chunking"""
-        import time
         start_time = time.time()
         
         # Use longer timeout if system is actively processing
@@ -711,8 +1568,8 @@ def create_app(test_config=None):
         try:
             # Test 1: Basic tokenization
             test_text = "テスト"
-            response = requests.post(
-                f"{YOMITAN_API_URL}/tokenize",
+            response = yomitan_session.post(
+                YOMITAN_TOKENIZE_URL,
                 json={"text": test_text, "scanLength": 1},
                 timeout=timeout
             )
@@ -721,14 +1578,14 @@ def create_app(test_config=None):
             if response.status_code != 200:
                 return False, f"❌ Yomitan tokenize failed: HTTP {response.status_code}{status_suffix}", response_time
             
-            result = response.json()
+            result = parse_json_response(response)
             if not (result and isinstance(result, list) and len(result) > 0):
                 return False, f"⚠️ Yomitan returned unexpected format: {result}{status_suffix}", response_time
             
             # Test 2: Chunking functionality with longer text (only if not extended timeout to avoid double-processing)
             if not extended_timeout:
                 long_text = "これは長いテストテキストです。" * 100  # Create ~3000 character text
-                words, success = tokenize_with_yomitan_api(long_text, chunk_size=1000)  # Force chunking
+                words, success, _ = tokenize_with_yomitan_api(long_text, chunk_size=1000)  # Force chunking
                 
                 if not success:
                     return False, f"❌ Chunked tokenization failed{status_suffix}", response_time
@@ -756,12 +1613,11 @@ def create_app(test_config=None):
         Check if Anki Connect is running and responding.
         Returns (is_healthy, status_message, response_time)
         """
-        import time
         start_time = time.time()
         
         try:
             # Test Anki Connect by calling the version action
-            response = requests.post(
+            response = anki_session.post(
                 ANKI_CONNECT_URL,
                 json={
                     "action": "version",
@@ -773,7 +1629,7 @@ def create_app(test_config=None):
             
             if response.status_code == 200:
                 try:
-                    result = response.json()
+                    result = parse_json_response(response)
                     if result.get("error") is None and result.get("result") is not None:
                         version = result.get("result")
                         return True, f"✅ Anki Connect v{version} responding ({response_time}ms)", response_time
@@ -797,7 +1653,8 @@ def create_app(test_config=None):
         """
         Use Yomitan API for superior Japanese tokenization with chunking support.
         Splits long texts into chunks to handle API limitations.
-        Returns (words, success_flag) tuple.
+        Returns (words, success_flag, complete) tuple, where complete is True
+        only if every chunk was tokenized by a successful Yomitan response.
         """
         global progress_tracker
         
@@ -805,7 +1662,7 @@ def create_app(test_config=None):
             chunk_size = YOMITAN_CHUNK_SIZE
             
         if not text or not text.strip():
-            return [], True
+            return [], True, True
             
         # If text is short enough, process normally
         if len(text) <= chunk_size:
@@ -815,120 +1672,80 @@ def create_app(test_config=None):
                     'message': 'Processing text...',
                     'progress': 50
                 }
-            return _tokenize_single_chunk(text, max_scan_length)
+            with yomitan_operation():
+                return _tokenize_single_chunk(text, max_scan_length)
         
-        # Split long text into chunks
+        # Split long text into chunks; only the offsets are kept up front
         all_words = []
-        chunks = _split_text_into_chunks(text, chunk_size)
+        bounds = list(_iter_chunk_bounds(text, chunk_size))
+        total_chunks = len(bounds)
         
         if progress_id:
             progress_tracker[progress_id] = {
                 'stage': 'chunking',
-                'message': f'Split text into {len(chunks)} chunks',
-                'total_chunks': len(chunks),
+                'message': f'Split text into {total_chunks} chunks',
+                'total_chunks': total_chunks,
                 'completed_chunks': 0,
                 'progress': 10
             }
         
-        for i, chunk in enumerate(chunks, 1):            
-            if progress_id:
-                progress_tracker[progress_id] = {
-                    'stage': 'tokenizing',
-                    'message': f'Processing chunk {i} of {len(chunks)}...',
-                    'total_chunks': len(chunks),
-                    'completed_chunks': i - 1,
-                    'progress': 10 + (i - 1) / len(chunks) * 80
-                }
-            
-            chunk_words, success = _tokenize_single_chunk(chunk, max_scan_length)
-            
-            if not success:
-                continue
-                
-            all_words.extend(chunk_words)
-            
-            if progress_id:
-                progress_tracker[progress_id] = {
-                    'stage': 'tokenizing',
-                    'message': f'Completed chunk {i} of {len(chunks)} ({len(chunk_words)} tokens)',
-                    'total_chunks': len(chunks),
-                    'completed_chunks': i,
-                    'progress': 10 + i / len(chunks) * 80
-                }
-        
+        # Chunks are independent IO-bound requests, so keep several in flight
+        # and reassemble the results in chunk order afterwards. Each chunk is
+        # sliced only when submitted, and at most max_in_flight are pending, so
+        # a second copy of the whole text never exists at once.
+        chunk_results = [None] * total_chunks
+        completed = 0
+        max_in_flight = YOMITAN_TOKENIZE_WORKERS * 2
+        pending_bounds = iter(enumerate(bounds))
+        with yomitan_operation():
+            futures = {}
+            while True:
+                for i, (start, end) in itertools.islice(pending_bounds, max_in_flight - len(futures)):
+                    futures[yomitan_pool.submit(_tokenize_single_chunk, text[start:end], max_scan_length)] = i
+                if not futures:
+                    break
+
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    i = futures.pop(future)
+                    chunk_results[i] = future.result()
+                    completed += 1
+
+                    if progress_id and progress_update_due(progress_id):
+                        progress_tracker[progress_id] = {
+                            'stage': 'tokenizing',
+                            'message': f'Completed chunk {completed} of {total_chunks} ({len(chunk_results[i][0])} tokens)',
+                            'total_chunks': total_chunks,
+                            'completed_chunks': completed,
+                            'progress': 10 + completed / total_chunks * 80
+                        }
+
+        complete = True
+        for chunk_words, success, chunk_complete in chunk_results:
+            if success:
+                all_words.extend(chunk_words)
+            complete = complete and chunk_complete
+
         total_success = len(all_words) > 0  # Success if we got any tokens
         
         if progress_id:
             progress_tracker[progress_id] = {
                 'stage': 'complete',
                 'message': f'Tokenization complete! {len(all_words)} total tokens',
-                'total_chunks': len(chunks),
-                'completed_chunks': len(chunks),
+                'total_chunks': total_chunks,
+                'completed_chunks': total_chunks,
                 'progress': 90
             }
         
-        return all_words, total_success
-
-    def _split_text_into_chunks(text, chunk_size):
-        """
-        Split text into chunks, trying to break at natural boundaries.
-        Prioritizes sentence endings, then punctuation, then whitespace.
-        """
-        if len(text) <= chunk_size:
-            return [text]
-        
-        chunks = []
-        start = 0
-        
-        while start < len(text):
-            end = start + chunk_size
-            
-            if end >= len(text):
-                # Last chunk
-                chunks.append(text[start:])
-                break
-            
-            # Try to find a good break point within the last 200 characters
-            search_start = max(start, end - 200)
-            chunk_text = text[start:end]
-            
-            # Look for sentence endings (Japanese punctuation)
-            for punct in ['。', '！', '？', '…', '』', '」']:
-                punct_pos = chunk_text.rfind(punct, search_start - start)
-                if punct_pos != -1:
-                    end = start + punct_pos + 1
-                    break
-            else:
-                # Look for other punctuation
-                for punct in ['、', '・', '）', '｝']:
-                    punct_pos = chunk_text.rfind(punct, search_start - start)
-                    if punct_pos != -1:
-                        end = start + punct_pos + 1
-                        break
-                else:
-                    # Look for whitespace
-                    for ws in ['\n', ' ', '　']:  # 　 is full-width space
-                        ws_pos = chunk_text.rfind(ws, search_start - start)
-                        if ws_pos != -1:
-                            end = start + ws_pos + 1
-                            break
-            
-            chunks.append(text[start:end])
-            start = end
-        
-        return chunks
+        return all_words, total_success, complete
 
     def _tokenize_single_chunk(text, max_scan_length=50):
         """
         Tokenize a single chunk of text with Yomitan API.
-        Returns (words, success_flag) tuple.
+        Returns (words, success_flag, complete) tuple; complete is False when
+        the request failed and the words come from the character-split fallback.
         """
-        global active_yomitan_operations
-        
         try:
-            # Increment active operations counter
-            active_yomitan_operations += 1
-            
             # Make request to Yomitan API tokenize endpoint
             # IMPORTANT: scanLength parameter is required for the API to work
             params = {
@@ -936,14 +1753,14 @@ def create_app(test_config=None):
                 "scanLength": max_scan_length
             }
             
-            response = requests.post(
-                f"{YOMITAN_API_URL}/tokenize", 
+            response = yomitan_session.post(
+                YOMITAN_TOKENIZE_URL,
                 json=params, 
                 timeout=YOMITAN_API_TIMEOUT
             )
             
             if response.status_code == 200:
-                result = response.json()
+                result = parse_json_response(response)
                 
                 # Extract text segments from Yomitan response
                 words = []
@@ -971,121 +1788,59 @@ def create_app(test_config=None):
                         elif isinstance(token, str):
                             words.append(token)
                 
-                return words, True  # Success flag
+                return words, True, True  # Success flag, real Yomitan result
             else:
-                return [], False
+                return [], False, False
                 
         except requests.exceptions.Timeout as e:
-            return _simple_japanese_tokenize(text), True
+            return _simple_japanese_tokenize(text), True, False
         except requests.exceptions.ConnectionError as e:
-            return _simple_japanese_tokenize(text), True
+            return _simple_japanese_tokenize(text), True, False
         except requests.exceptions.RequestException as e:
-            return _simple_japanese_tokenize(text), True
+            return _simple_japanese_tokenize(text), True, False
         except Exception as e:
-            return _simple_japanese_tokenize(text), True
-        finally:
-            # Always decrement counter, even on error
-            active_yomitan_operations = max(0, active_yomitan_operations - 1)
-
-    def _simple_japanese_tokenize(text):
-        """
-        Simple Japanese tokenization fallback that preserves common adjectives.
-        This is a basic approach to avoid over-splitting i-adjectives.
-        """
-        if not text or len(text) == 0:
-            return []
-        
-        # Common Japanese i-adjectives that should NOT be split
-        common_i_adjectives = {
-            '熱い', '冷たい', '暖かい', '涼しい', '温かい',  # Temperature
-            '固い', '柔らかい', '硬い', '軟らかい',           # Texture
-            '重い', '軽い', '厚い', '薄い', '太い', '細い',    # Physical properties  
-            '高い', '低い', '長い', '短い', '広い', '狭い',    # Size/dimension
-            '新しい', '古い', '若い', '美しい', '可愛い',      # Age/beauty
-            '大きい', '小さい', '多い', '少ない',            # Quantity
-            '早い', '遅い', '速い', '安い', '高い',          # Speed/cost
-            '良い', '悪い', '正しい', '間違い', '危ない',      # Quality/safety
-            '楽しい', '悲しい', '嬉しい', '苦しい', '痛い',    # Emotions/sensations
-            '難しい', '易しい', '忙しい', '暇い',            # Difficulty/business
-            '面白い', '詰まらない', '珍しい', '普通い',        # Interest
-            '眠い', '疲れい', '元気い', '健康い'             # Health/energy
-        }
-        
-        tokens = []
-        i = 0
-        while i < len(text):
-            # Check for multi-character adjectives first
-            found_adjective = False
-            for adj in common_i_adjectives:
-                if text[i:i+len(adj)] == adj:
-                    tokens.append(adj)
-                    i += len(adj)
-                    found_adjective = True
-                    break
-            
-            if not found_adjective:
-                # Single character fallback
-                char = text[i]
-                if char.strip():  # Skip whitespace
-                    tokens.append(char)
-                i += 1
-        
-        return tokens
-    
-    def filter_japanese_tokens(words):
-        """
-        Comprehensive filtering for Japanese tokens to remove junk.
-        Applied to Yomitan API results.
-        """
-        filtered_words = []
-        
-        for word in words:
-            # Skip empty or whitespace-only tokens
-            if not word or not word.strip():
-                continue
-                
-            # Skip pure punctuation, symbols, and decorative characters
-            if re.match(r'^[。、！？「」『』（）・…ー～〜♡♥★☆◇◆■□▪▫●○◎▲△▼▽◀▶▲▼←→↑↓♪♫※\s\-\u2000-\u206F\u2E00-\u2E7F\u3000-\u303F\uFF00-\uFFEF]+$', word):
-                continue
-                
-            # Skip tokens that are mostly decorative symbols/punctuation
-            symbol_count = len(re.findall(r'[♡♥★☆◇◆■□▪▫●○◎▲△▼▽◀▶▲▼←→↑↓♪♫※。、！？「」『』（）・…ー～〜\s\-\u2000-\u206F\u2E00-\u2E7F\u3000-\u303F\uFF00-\uFFEF]', word))
-            if symbol_count >= len(word) * 0.7:  # If 70% or more are symbols/punctuation
-                continue
-            
-            # Skip single character particles and auxiliary verbs
-            if len(word) == 1 and word in 'はをにがでとやかのもてだよねなをれしたっつくぐすむぶぬ':
-                continue
-            
-            # Skip single hiragana characters (usually fragments) - but preserve important ones
-            if len(word) == 1 and re.match(r'^[\u3040-\u309F]$', word):
-                # Don't skip い (adjective ending) and other important single characters
-                important_single = {'い', 'う', 'き', 'く', 'し', 'す', 'つ', 'ぬ', 'ふ', 'む', 'ゆ', 'る'}
-                if word not in important_single:
-                    continue
-                
-            # Skip single katakana characters (usually fragments) 
-            if len(word) == 1 and re.match(r'^[\u30A0-\u30FF]$', word):
-                continue
-            
-            # Skip very short hiragana fragments (likely incomplete words)
-            if len(word) <= 2 and re.match(r'^[\u3040-\u309F]+$', word):
-                # Allow common complete words only
-                allowed_short = {'です', 'ます', 'この', 'その', 'あの', 'どの', 'これ', 'それ', 
-                               'あれ', 'どれ', 'から', 'まで', 'より', 'など', 'でも', 'もう', 
-                               'まだ', 'もの', 'こと', 'とき', 'ため', 'ごと', 'けど'}
-                if word not in allowed_short:
-                    continue
-            
-            # Skip fragments that are just conjugation endings
-            if re.match(r'^[っつくぐすむぶぬたるれ]{1,2}$', word):
-                continue
-            
-            # Include word if it contains Japanese content OR is non-Japanese text that passed all checks
-            if re.search(r'[\u3040-\u309F\u30A0-\u30FF\u4E00-\u9FAF]', word) or not re.match(r'^[\u3040-\u309F\u30A0-\u30FF\u4E00-\u9FAF]+$', word):
-                filtered_words.append(word)
-        
-        return filtered_words
+            return _simple_japanese_tokenize(text), True, False
+
+    def get_token_cache_key(text):
+        """Hash the text together with the chunk size, which affects token boundaries."""
+        hasher = hashlib.blake2b(digest_size=16)
+        hasher.update(f"{YOMITAN_CHUNK_SIZE}\n".encode('utf-8'))
+        hasher.update(text.encode('utf-8'))
+        return hasher.hexdigest()
+
+    def load_cached_tokens(cache_key):
+        """Return the cached token list for cache_key, or None on a miss."""
+        cache_file = os.path.join(get_token_cache_dir(), f"tok_{cache_key}.json")
+        try:
+            words = load_json_file(cache_file)
+            # Refresh the mtime so eviction drops the least recently used files
+            os.utime(cache_file)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as exc:
+            app.logger.warning("Ignoring unreadable token cache %s: %s", cache_file, exc)
+            return None
+        return words if isinstance(words, list) else None
+
+    def save_cached_tokens(cache_key, words):
+        """Write a token list to the cache and evict the oldest entries over the limit."""
+        cache_dir = get_token_cache_dir()
+        cache_file = os.path.join(cache_dir, f"tok_{cache_key}.json")
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp_file = f"{cache_file}.tmp"
+            dump_json_file(words, tmp_file, indent=False)
+            os.replace(tmp_file, cache_file)
+
+            with os.scandir(cache_dir) as entries:
+                cached = [(entry.stat().st_mtime_ns, entry.path) for entry in entries
+                          if entry.name.startswith('tok_') and entry.name.endswith('.json')]
+            if len(cached) > TOKEN_CACHE_MAX_FILES:
+                cached.sort()
+                for _, path in cached[:len(cached) - TOKEN_CACHE_MAX_FILES]:
+                    os.unlink(path)
+        except (OSError, TypeError, ValueError) as exc:
+            app.logger.warning("Failed to save token cache %s: %s", cache_file, exc)
 
     def tokenize_japanese_text(text, progress_id=None):
         """
@@ -1105,10 +1860,23 @@ def create_app(test_config=None):
             }
         
         # Remove HTML tags if present
-        text = re.sub(r'<[^>]+>', '', text.strip())
+        text = strip_html_tags(text.strip())
+
+        # Identical text was tokenized before - reuse the filtered tokens
+        cache_key = get_token_cache_key(text)
+        cached_words = load_cached_tokens(cache_key)
+        if cached_words is not None:
+            if progress_id:
+                # Not 'complete': that stage ends the progress stream, and analysis goes on
+                progress_tracker[progress_id] = {
+                    'stage': 'filtering',
+                    'message': f'Loaded {len(cached_words)} tokens from cache',
+                    'progress': 95
+                }
+            return cached_words
         
         # Use Yomitan API for dictionary-based tokenization
-        yomitan_words, success = tokenize_with_yomitan_api(text, progress_id=progress_id)
+        yomitan_words, success, complete = tokenize_with_yomitan_api(text, progress_id=progress_id)
         
         if success and yomitan_words:
             if progress_id:
@@ -1119,6 +1887,9 @@ def create_app(test_config=None):
                 }
             
             filtered_words = filter_japanese_tokens(yomitan_words)
+            # Fallback or partial tokenizations would outlive the outage that caused them
+            if complete:
+                save_cached_tokens(cache_key, filtered_words)
             
             if progress_id:
                 progress_tracker[progress_id] = {
@@ -1130,8 +1901,8 @@ def create_app(test_config=None):
             return filtered_words
         
         # No fallback - require Yomitan API for quality tokenization
-        print("❌ Yomitan API not available - cannot tokenize text")
-        print("💡 Please ensure Yomitan API server is running at http://127.0.0.1:19633")
+        app.logger.error("Yomitan API not available - cannot tokenize text. "
+                         "Please ensure the Yomitan API server is running at %s", YOMITAN_API_URL)
         
         if progress_id:
             progress_tracker[progress_id] = {
@@ -1153,8 +1924,14 @@ def create_app(test_config=None):
                 'progress': 0
             }
         
-        # Load ignored words
-        ignored_words = load_ignored_words()
+        # Constant-time membership for the per-word checks below
+        if not isinstance(vocabulary_set, (set, frozenset)):
+            vocabulary_set = frozenset(vocabulary_set)
+
+        # Snapshot ignored words so ignores made while this analysis runs cannot
+        # change the set mid-iteration
+        with ignored_words_lock:
+            ignored_words = frozenset(load_ignored_words())
         
         words = tokenize_japanese_text(text_content, progress_id=progress_id)
         
@@ -1175,19 +1952,34 @@ def create_app(test_config=None):
         
         total_unique = len(word_counts)
         processed = 0
-        
+
+        def report_frequency_progress(done, total):
+            if progress_update_due(progress_id):
+                progress_tracker[progress_id] = {
+                    'stage': 'analyzing',
+                    'message': f'Getting frequency data: {done}/{total} words looked up',
+                    'progress': 40 + (done / total) * 40
+                }
+
+        # Fetch frequency data for all unique words with batched requests
+        frequency_results = get_yomitan_frequency_data_batch(
+            word_counts.keys(), progress=report_frequency_progress if progress_id else None
+        )
+        # Rewriting frequency_cache.json is left to the background writer
+        if frequency_cache_dirty:
+            scan_save_pool.submit(save_frequency_data)
+
         for word, count in word_counts.items():
             processed += 1
             
-            if progress_id:
+            if progress_id and progress_update_due(progress_id):
                 progress_tracker[progress_id] = {
                     'stage': 'vocabulary_lookup',
                     'message': f'Processing word {processed}/{total_unique}: {word} (frequency + vocabulary)',
-                    'progress': 40 + (processed / total_unique) * 50
+                    'progress': 80 + (processed / total_unique) * 10
                 }
             
-            # Get frequency data from yomitan for this word
-            freq_data = get_yomitan_frequency_data(word)
+            freq_data = frequency_results[word]
             
             # Simple one-to-one vocabulary comparison
             is_in_vocab = word in vocabulary_set
@@ -1214,32 +2006,8 @@ def create_app(test_config=None):
             else:
                 unknown_words.append(word_entry)
         
-        
-        # Deduplicate results - merge entries with same display word
-        def deduplicate_word_list(word_list):
-            """Merge word entries with the same display word, combining their counts."""
-            word_dict = {}
-            for entry in word_list:
-                word_key = entry['word']
-                if word_key in word_dict:
-                    # Merge with existing entry
-                    existing = word_dict[word_key]
-                    existing['count'] += entry['count']
-                    # Keep the first entry's other properties (frequency, etc.)
-                    # but track all original words for debugging
-                    if 'original_words' not in existing:
-                        existing['original_words'] = [existing.get('original_word', word_key)]
-                    existing['original_words'].append(entry.get('original_word', word_key))
-                else:
-                    # First occurrence of this word
-                    word_dict[word_key] = entry.copy()
-            
-            return list(word_dict.values())
-        
-        # Apply deduplication to all lists
-        all_words_with_frequency = deduplicate_word_list(all_words_with_frequency)
-        known_words = deduplicate_word_list(known_words)
-        unknown_words = deduplicate_word_list(unknown_words)
+        # word_counts keys are unique, so each display word already has exactly one
+        # entry; the category lists share those dicts with all_words_with_frequency
         
         # Sort by frequency (most common first)
         all_words_with_frequency.sort(key=lambda x: x['count'], reverse=True)
@@ -1264,6 +2032,7 @@ def create_app(test_config=None):
                 'message': f'Analysis complete! Found {freq_matches} frequency matches, {vocab_matches} vocabulary matches via yomitan',
                 'progress': 100
             }
+            progress_last_update.pop(progress_id, None)
         
         # Calculate three-category frequency statistics (Known/Ignored/Unknown)
         star_stats = calculate_three_category_frequency_statistics(known_words, ignored_words_with_data, unknown_words)
@@ -1323,17 +2092,22 @@ def create_app(test_config=None):
         # Get uploaded novels with cover images
         novels = []
         if os.path.exists(novel_dir):
-            for filename in os.listdir(novel_dir):
+            with os.scandir(novel_dir) as it:
+                entries = list(it)
+
+            # One directory read; cover lookups below are set membership tests
+            names = {entry.name for entry in entries}
+
+            for entry in entries:
+                filename = entry.name
                 if allowed_file(filename):
-                    file_path = os.path.join(novel_dir, filename)
-                    file_stat = os.stat(file_path)
+                    file_stat = entry.stat()
                     
                     # Check for cover image with same name but different extension
-                    base_name = filename.rsplit('.', 1)[0]
+                    base_name = filename.rpartition('.')[0]
                     cover_image = None
-                    for ext in ['jpg', 'jpeg', 'png', 'gif', 'bmp', 'webp']:
-                        cover_path = os.path.join(novel_dir, f"{base_name}.{ext}")
-                        if os.path.exists(cover_path):
+                    for ext in COVER_EXTENSIONS:
+                        if f"{base_name}.{ext}" in names:
                             cover_image = f"{base_name}.{ext}"
                             break
                     
@@ -1341,7 +2115,7 @@ def create_app(test_config=None):
                         'filename': filename,
                         'size': file_stat.st_size,
                         'modified': datetime.fromtimestamp(file_stat.st_mtime),
-                        'display_name': filename.rsplit('.', 1)[0],
+                        'display_name': base_name,
                         'cover_image': cover_image
                     })
         
@@ -1357,7 +2131,8 @@ def create_app(test_config=None):
     @app.route('/health/yomitan')
     def yomitan_health():
         """Check Yomitan API health status"""
-        is_healthy, status_message, response_time = check_yomitan_health()
+        force = request.args.get('force', '').lower() in ('1', 'true', 'yes')
+        is_healthy, status_message, response_time = check_yomitan_health(force=force)
         
         return {
             'healthy': is_healthy,
@@ -1437,12 +2212,7 @@ def create_app(test_config=None):
             return redirect(url_for('home'))
         
         # Find the matching cache
-        caches = get_available_caches()
-        selected_cache = None
-        for cache in caches:
-            if cache['key'] == cache_key:
-                selected_cache = cache
-                break
+        selected_cache = find_cache_by_key(cache_key)
         
         if not selected_cache:
             flash('Cache not found', 'error')
@@ -1481,17 +2251,42 @@ def create_app(test_config=None):
         known_words = cached_data.get('known_words', [])
         unknown_words = cached_data.get('unknown_words', [])
         ignored_words = cached_data.get('ignored_words', [])
+        word_lists = {'known': known_words, 'unknown': unknown_words, 'ignored': ignored_words}
+        page_size = max(1, request.args.get('page_size', WORD_LIST_PAGE_SIZE, type=int))
+        
+        # Later pages of one word list, requested by the page as a section is expanded
+        page = request.args.get('page', type=int)
+        if page is not None:
+            words = word_lists.get(request.args.get('category'))
+            if words is None or page < 0:
+                return {'error': 'Unknown word list page'}, 400
+            start = page * page_size
+            word_items = get_template_attribute('word_items.html', 'word_items')
+            return {
+                'html': str(word_items(words[start:start + page_size], request.args['category'])),
+                'has_more': start + page_size < len(words)
+            }
         
-        # Calculate star statistics using the same function as the main analysis
-        star_stats = calculate_three_category_frequency_statistics(known_words, ignored_words, unknown_words)
+        # Star statistics are stored at save time; older rows are recalculated
+        star_stats = cached_data.get('star_statistics')
+        if star_stats is None:
+            star_stats = calculate_three_category_frequency_statistics(known_words, ignored_words, unknown_words)
         
         # Calculate unique words count (total of all categories)
         unique_words_count = len(known_words) + len(unknown_words) + len(ignored_words)
+
+        # Instance totals are stored at save time; older rows need them summed
+        known_word_count = cached_data.get('known_instance_count')
+        if known_word_count is None:
+            known_word_count = sum(item['count'] for item in known_words)
+        unknown_word_count = cached_data.get('unknown_instance_count')
+        if unknown_word_count is None:
+            unknown_word_count = sum(item['count'] for item in unknown_words)
             
         analysis = {
-            'known_words': known_words,
-            'unknown_words': unknown_words,
-            'ignored_words': ignored_words,
+            'known_words': known_words[:page_size],
+            'unknown_words': unknown_words[:page_size],
+            'ignored_words': ignored_words[:page_size],
             'star_distribution': cached_data['star_distribution'],
             'comprehension_rate': cached_data['comprehension_rate'],
             'difficulty_level': cached_data['difficulty_level'],
@@ -1499,8 +2294,8 @@ def create_app(test_config=None):
             'total_instances': cached_data['total_instances'],
             'total_processed_words': total_processed_words,
             'unique_words': unique_words_count,
-            'known_word_count': sum(item['count'] for item in known_words) if known_words else 0,
-            'unknown_word_count': sum(item['count'] for item in unknown_words) if unknown_words else 0,
+            'known_word_count': known_word_count,
+            'unknown_word_count': unknown_word_count,
             'ignored_word_count': len(ignored_words),
             'star_statistics': star_stats
         }
@@ -1509,6 +2304,8 @@ def create_app(test_config=None):
                              filename=cached_data['filename'] or 'Cached Analysis',
                              cache_info={'name': 'Cached Analysis', 'created_at': cached_data['created_at']},
                              analysis=analysis,
+                             word_totals={category: len(words) for category, words in word_lists.items()},
+                             word_page_size=page_size,
                              is_cached=True)
 
     @app.route('/scan_history')
@@ -1535,9 +2332,7 @@ def create_app(test_config=None):
         referrer = request.referrer or ''
         if 'file_records' in referrer:
             # Extract filename from referrer URL to redirect back to the same file_records page
-            import re
-            from urllib.parse import unquote
-            match = re.search(r'/file_records/([^/?]+)', referrer)
+            match = _FILE_RECORDS_RE.search(referrer)
             if match:
                 filename = unquote(match.group(1))
                 return redirect(url_for('file_records', filename=filename))
@@ -1562,27 +2357,28 @@ def create_app(test_config=None):
         """Test progress tracking system"""
         test_id = str(uuid.uuid4())
         
-        # Simulate progress updates
-        def update_progress():
-            stages = [
-                ('starting', 'Test starting...', 10),
-                ('tokenizing', 'Test tokenizing...', 30),
-                ('analyzing', 'Test analyzing...', 70),
-                ('complete', 'Test complete!', 100)
-            ]
-            
-            for stage, message, progress in stages:
-                progress_tracker[test_id] = {
-                    'stage': stage,
-                    'message': message,
-                    'progress': progress
-                }
-                time.sleep(2)  # Wait 2 seconds between updates
+        # Simulate progress updates: each stage is posted by a short-lived timer
+        # that schedules the next one, so no thread sleeps through the whole run
+        stages = [
+            ('starting', 'Test starting...', 10),
+            ('tokenizing', 'Test tokenizing...', 30),
+            ('analyzing', 'Test analyzing...', 70),
+            ('complete', 'Test complete!', 100)
+        ]
+        
+        def post_stage(index):
+            stage, message, progress = stages[index]
+            progress_tracker[test_id] = {
+                'stage': stage,
+                'message': message,
+                'progress': progress
+            }
+            if index + 1 < len(stages):
+                timer = threading.Timer(2, post_stage, args=(index + 1,))  # 2 seconds between updates
+                timer.daemon = True
+                timer.start()
         
-        # Start progress updates in background (in a real app, use threading or celery)
-        import threading
-        thread = threading.Thread(target=update_progress)
-        thread.start()
+        post_stage(0)
         
         return render_template('analysis_progress.html',
                              filename='test-file.txt',
@@ -1606,16 +2402,7 @@ def create_app(test_config=None):
                 """
             
             selected_cache = caches[0]  # Use first available cache
-            cache_file_path = os.path.join(anki_manager.cache_dir, selected_cache['filename'])
-            with open(cache_file_path, 'r', encoding='utf-8') as f:
-                cache_data = json.load(f)
-            
-            # Extract vocabulary set
-            vocabulary_set = set()
-            for card_data in cache_data['cards'].values():
-                expr = card_data['expression'].strip()
-                if expr:
-                    vocabulary_set.add(expr)
+            vocabulary_set = load_vocabulary_set(selected_cache['filename'])
             
             # Test text with words likely to have different dictionary forms
             test_text = "熱いお茶を飲みました。固いパンを食べます。"  # Test adjectives that were being split
@@ -1645,57 +2432,9 @@ def create_app(test_config=None):
                 'sample_words': words_with_freq[:10]  # First 10 words with frequency
             }
             
-            return f"""
-            <html>
-            <head><title>New Universal Analysis Test</title></head>
-            <body>
-            <h1>✅ New Universal Frequency Analysis Test</h1>
-            
-            <h2>Test Setup:</h2>
-            <ul>
-            <li><strong>Vocabulary cache used:</strong> {summary['cache_used']}</li>
-            <li><strong>Vocabulary size:</strong> {summary['vocabulary_size']} words</li>
-            <li><strong>Test text:</strong> <code>{summary['text_tested']}</code></li>
-            </ul>
-            
-            <h2>Analysis Results:</h2>
-            <ul>
-            <li><strong>Total words:</strong> {summary['total_words']}</li>
-            <li><strong>Unique words:</strong> {summary['unique_words']}</li>
-            <li><strong>Words analyzed:</strong> {summary['words_analyzed']}</li>
-            <li><strong>Words with frequency data:</strong> {summary['words_with_frequency']}</li>
-            <li><strong>Words in your vocabulary:</strong> {summary['words_with_vocab']} (via yomitan lookup!)</li>
-            </ul>
-            
-            <h2>🔍 Yomitan Vocabulary Matching Examples:</h2>
-            <ul>
-            {''.join([f"<li>'{word['word']}' → '{word['matched_form']}' ✅ (matched via yomitan)</li>" for word in summary['yomitan_vocab_matches']]) if summary['yomitan_vocab_matches'] else '<li>No yomitan vocabulary transformations in this sample</li>'}
-            </ul>
-            
-            <h2>Star Rating Distribution:</h2>
-            <ul>
-            <li>5 stars: {summary['star_distribution'][5]} words</li>
-            <li>4 stars: {summary['star_distribution'][4]} words</li>
-            <li>3 stars: {summary['star_distribution'][3]} words</li>
-            <li>2 stars: {summary['star_distribution'][2]} words</li>
-            <li>1 star: {summary['star_distribution'][1]} words</li>
-            <li>0 stars: {summary['star_distribution'][0]} words</li>
-            <li><strong>Average rating:</strong> {summary['average_rating']} stars</li>
-            </ul>
-            
-            <h2>Sample Words with Frequency Data:</h2>
-            <ul>
-            {''.join([f"<li>{word['word']}: rank {word['rank']}, appears {word['count']}x, in vocab: {'Yes' if word['in_vocabulary'] else 'No'}</li>" for word in summary['sample_words']])}
-            </ul>
-            
-            <p><strong>🎉 SUCCESS:</strong> The new yomitan-powered analysis is working! Analyzing <strong>ALL words</strong> for frequency + using <strong>yomitan dictionary forms</strong> for vocabulary matching (e.g., おちゃ → お茶).</p>
-            <p><a href="/">← Back to main page</a></p>
-            </body>
-            </html>
-            """
+            return render_template('test_new_analysis.html', **summary)
             
         except Exception as e:
-            import traceback
             return f"""
             <html>
             <head><title>Test Error</title></head>
@@ -1720,14 +2459,23 @@ def create_app(test_config=None):
                     'progress': 0
                 }
             
-            while progress_id in progress_tracker:
-                progress = progress_tracker[progress_id]
-                yield f"data: {json.dumps(progress)}\n\n"
-                time.sleep(0.5)
+            # Wait for real updates instead of polling; a comment line every
+            # SSE_KEEPALIVE_SECONDS keeps idle connections open through proxies
+            last_sent = None
+            while True:
+                progress = progress_tracker.wait_for_update(progress_id, last_sent, SSE_KEEPALIVE_SECONDS)
+                if progress is None:
+                    break
+                if progress is last_sent:
+                    yield ": ping\n\n"
+                    continue
+
+                # Finished results are picked up by /analysis/results, not the stream
+                payload = {key: value for key, value in progress.items() if key != 'results'}
+                yield f"data: {dumps_json(payload)}\n\n"
+                last_sent = progress
                 
                 if progress.get('stage') in ['complete', 'error']:
-                    # Send one final update and break
-                    time.sleep(1)
                     break
             
         response = Response(generate(), mimetype='text/event-stream')
@@ -1770,16 +2518,10 @@ def create_app(test_config=None):
                     }
                     
                     # Read the novel file
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        text_content = f.read()
+                    text_content = read_text_file(file_path)
                     
                     # Find the matching cache
-                    caches = get_available_caches()
-                    selected_cache = None
-                    for cache in caches:
-                        if cache['key'] == cache_key:
-                            selected_cache = cache
-                            break
+                    selected_cache = find_cache_by_key(cache_key)
                     
                     if not selected_cache:
                         progress_tracker[progress_id] = {
@@ -1790,30 +2532,11 @@ def create_app(test_config=None):
                         return
                     
                     # Load vocabulary from cache
-                    cache_file_path = os.path.join(anki_manager.cache_dir, selected_cache['filename'])
-                    with open(cache_file_path, 'r', encoding='utf-8') as f:
-                        cache_data = json.load(f)
-                    
-                    # Extract vocabulary set
-                    vocabulary_set = set()
-                    for card_data in cache_data['cards'].values():
-                        expr = card_data['expression'].strip()
-                        if expr:
-                            vocabulary_set.add(expr)
+                    vocabulary_set = load_vocabulary_set(selected_cache['filename'])
                     
                     # Perform analysis with progress tracking
                     analysis = analyze_text_vocabulary(text_content, vocabulary_set, progress_id=progress_id)
                     
-                    # Save analysis to database
-                    try:
-                        scan_id = database.save_scan_result(
-                            analysis_data=analysis,
-                            text_content=text_content,
-                            filename=filename
-                        )
-                    except Exception:
-                        app.logger.exception("Failed to persist scan result for %s", filename)
-                    
                     # Store results in a way that doesn't require session context
                     # We'll use the progress_tracker to store results temporarily
                     progress_tracker[progress_id] = {
@@ -1827,6 +2550,9 @@ def create_app(test_config=None):
                         }
                     }
                     
+                    # Save analysis to database once the redirect is unblocked
+                    save_scan_in_background(analysis, text_content, filename)
+                    
                 except Exception as e:
                     app.logger.exception("Background analysis failed for %s", filename)
                     progress_tracker[progress_id] = {
@@ -1836,7 +2562,6 @@ def create_app(test_config=None):
                     }
         
         # Start analysis in background thread with app context
-        import threading
         thread = threading.Thread(
             target=run_analysis,
             args=(filename, cache_key, progress_id, app.app_context())
@@ -1928,10 +2653,10 @@ def create_app(test_config=None):
     def get_ignored_words():
         """Get the list of ignored words via AJAX"""
         try:
-            ignored_words = load_ignored_words()
+            ignored_words = get_sorted_ignored_words()
             return {
                 'success': True, 
-                'ignored_words': sorted(list(ignored_words)),
+                'ignored_words': ignored_words,
                 'count': len(ignored_words)
             }
         except Exception as e:
@@ -2039,17 +2764,16 @@ def create_app(test_config=None):
             start_time = datetime.now()
             
             # Process based on action
+            # Expressions come from the same cache data that was synced/loaded, so
+            # the cache file is parsed once per request
             if action == 'full_refresh':
-                cache_data = anki_manager.update_card_cache(note_type, field, force_full_update=True)
-                expressions = anki_manager.get_expressions(note_type, field, update_cache=False)
+                expressions, cache_data = anki_manager.get_expressions_and_cache(note_type, field, force_full_update=True)
                 flash(f'Full refresh completed for {note_type} - {field}', 'success')
             elif action == 'load_only':
-                expressions = anki_manager.get_expressions(note_type, field, update_cache=False)
-                cache_data = anki_manager.load_cache(note_type, field)
+                expressions, cache_data = anki_manager.get_expressions_and_cache(note_type, field)
                 flash(f'Loaded existing cache for {note_type} - {field}', 'info')
             else:  # incremental update
-                expressions = anki_manager.get_expressions(note_type, field, update_cache=True)
-                cache_data = anki_manager.load_cache(note_type, field)
+                expressions, cache_data = anki_manager.get_expressions_and_cache(note_type, field, update_cache=True)
                 flash(f'Incremental update completed for {note_type} - {field}', 'success')
 
             # Processing time
@@ -2071,24 +2795,8 @@ def create_app(test_config=None):
     @app.route('/settings')
     def settings():
         """Unified settings page with Anki setup and cache status"""
-        # Cache status information
-        cache_info = []
-        if os.path.exists(anki_manager.cache_dir):
-            for file in os.listdir(anki_manager.cache_dir):
-                if file.endswith('.json'):
-                    try:
-                        file_path = os.path.join(anki_manager.cache_dir, file)
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            data = json.load(f)
-                            cache_info.append({
-                                'filename': file,
-                                'note_type': data['metadata'].get('note_type', 'Unknown'),
-                                'field_name': data['metadata'].get('field_name', 'Unknown'),
-                                'last_updated': data['metadata'].get('last_updated', 'Never'),
-                                'total_cards': data['metadata'].get('total_cards', 0)
-                            })
-                    except (OSError, json.JSONDecodeError, KeyError, TypeError) as exc:
-                        app.logger.warning("Skipping invalid cache metadata file %s: %s", file, exc)
+        # Cache status information (metadata is reused while cache files are unchanged)
+        cache_info = get_available_caches()
 
         # Check if any cache exists
         cache_exists = len(cache_info) > 0
@@ -2110,23 +2818,7 @@ def create_app(test_config=None):
     @app.route('/cache_status')
     def cache_status():
         """Show status of all cached data"""
-        cache_info = []
-        if os.path.exists(anki_manager.cache_dir):
-            for file in os.listdir(anki_manager.cache_dir):
-                if file.endswith('.json'):
-                    try:
-                        file_path = os.path.join(anki_manager.cache_dir, file)
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            data = json.load(f)
-                            cache_info.append({
-                                'filename': file,
-                                'note_type': data['metadata'].get('note_type', 'Unknown'),
-                                'field_name': data['metadata'].get('field_name', 'Unknown'),
-                                'last_updated': data['metadata'].get('last_updated', 'Never'),
-                                'total_cards': data['metadata'].get('total_cards', 0)
-                            })
-                    except (OSError, json.JSONDecodeError, KeyError, TypeError) as exc:
-                        app.logger.warning("Skipping invalid cache metadata file %s: %s", file, exc)
+        cache_info = get_available_caches()
 
         return render_template('cache_status.html', cache_info=cache_info)
 
@@ -2167,20 +2859,27 @@ def create_app(test_config=None):
     @app.route('/clear_all_caches', methods=['POST'])
     def clear_all_caches():
         """Delete all vocabulary caches"""
+        def remove_cache_file(entry):
+            try:
+                os.remove(entry.path)
+                return True
+            except Exception as e:
+                app.logger.warning("Error deleting cache file %s: %s", entry.name, e)
+                return False
+        
         try:
             deleted_count = 0
-            deleted_files = []
             
             if os.path.exists(anki_manager.cache_dir):
-                for file in os.listdir(anki_manager.cache_dir):
-                    if file.endswith(('.json', '.pkl')) and not file in ['ignored_words.json', 'scan_history.db']:
-                        file_path = os.path.join(anki_manager.cache_dir, file)
-                        try:
-                            os.remove(file_path)
-                            deleted_files.append(file)
-                            deleted_count += 1
-                        except Exception as e:
-                            app.logger.warning("Error deleting cache file %s: %s", file, e)
+                # DirEntry carries the file type from the directory listing, so no per-file stat
+                with os.scandir(anki_manager.cache_dir) as entries:
+                    cache_files = [entry for entry in entries
+                                   if entry.name.endswith(('.json', '.pkl')) and entry.name not in NON_CACHE_FILES
+                                   and entry.is_file()]
+                # Unlinks are I/O-bound, so slow disks and network mounts benefit from overlapping them
+                if cache_files:
+                    with ThreadPoolExecutor(max_workers=min(CACHE_DELETE_WORKERS, len(cache_files))) as executor:
+                        deleted_count = sum(executor.map(remove_cache_file, cache_files))
             
             if deleted_count > 0:
                 flash(f'Successfully deleted {deleted_count} cache files', 'success')
@@ -2205,8 +2904,7 @@ def create_app(test_config=None):
         
         try:
             # Get expressions from cache
-            expressions = anki_manager.get_expressions(note_type, field_name, update_cache=False)
-            cache_data = anki_manager.load_cache(note_type, field_name)
+            expressions, cache_data = anki_manager.get_expressions_and_cache(note_type, field_name)
             
             if not expressions:
                 flash(f'No expressions found in cache for {note_type} - {field_name}', 'warning')
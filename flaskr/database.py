@@ -1,21 +1,65 @@
 import sqlite3
 import os
+import atexit
+import re
 import json
 import hashlib
+import threading
+import zlib
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 
+try:
+    import orjson
+except ImportError:  # optional speedup; fall back to the stdlib json module
+    orjson = None
+
 DATABASE_PATH = 'data/scan_history.db'
 
+# Bytes of the database file SQLite may memory-map per connection
+DATABASE_MMAP_SIZE = 256 * 1024 * 1024
+
+# Characters of text normalized per step while hashing, extended to the next whitespace
+TEXT_HASH_WINDOW = 65536
+_WHITESPACE_RE = re.compile(r'\s')
+
+# PRAGMA user_version from which text_hash holds blake2b digests (older rows hold md5)
+TEXT_HASH_SCHEMA_VERSION = 1
+
+# One connection per thread, reopened only if DATABASE_PATH changes. Request
+# threads are short-lived, so the app closes theirs in close_db_connection when
+# the app context ends; long-lived workers (scan-save pool) keep theirs
+_thread_local = threading.local()
+
 def get_db_connection():
-    """Get database connection with row factory"""
+    """Get this thread's database connection with row factory (WAL journal mode)"""
+    conn = getattr(_thread_local, 'conn', None)
+    if conn is not None and _thread_local.path == DATABASE_PATH:
+        return conn
+    if conn is not None:
+        conn.close()
     db_dir = os.path.dirname(DATABASE_PATH)
     if db_dir:
         os.makedirs(db_dir, exist_ok=True)
     conn = sqlite3.connect(DATABASE_PATH)
     conn.row_factory = sqlite3.Row
+    # WAL lets history pages read while an analysis is being saved
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    # Sorts/temp tables in memory; read the word-list JSON columns through a memory map
+    conn.execute('PRAGMA temp_store=MEMORY')
+    conn.execute(f'PRAGMA mmap_size={DATABASE_MMAP_SIZE}')
+    _thread_local.conn = conn
+    _thread_local.path = DATABASE_PATH
     return conn
 
+def close_db_connection():
+    """Close this thread's database connection, if it has one"""
+    conn = getattr(_thread_local, 'conn', None)
+    if conn is not None:
+        _thread_local.conn = None
+        conn.close()
+
 def init_database():
     """Initialize the scan history database with required tables"""
     conn = get_db_connection()
@@ -48,9 +92,13 @@ def init_database():
         )
     ''')
     
-    # Create index on text_hash for faster lookups
-    conn.execute('CREATE INDEX IF NOT EXISTS idx_text_hash ON scan_history(text_hash)')
+    # Index on text_hash for faster lookups; it also covers the newest-scan check
+    # (id, created_at) so that never reads the table rows with their JSON columns
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_hash_created ON scan_history(text_hash, created_at DESC, id)')
+    conn.execute('DROP INDEX IF EXISTS idx_text_hash')  # prefix of idx_hash_created
     conn.execute('CREATE INDEX IF NOT EXISTS idx_created_at ON scan_history(created_at)')
+    # Per-file records are filtered by filename and listed newest first
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_filename_created_at ON scan_history(filename, created_at DESC)')
     
     # Add total_processed_words column if it doesn't exist (migration for existing databases)
     try:
@@ -64,18 +112,98 @@ def init_database():
         else:
             print(f"Warning: Could not add total_processed_words column: {e}")
     
+    # Pre-aggregated totals and star statistics (NULL for rows saved before these existed)
+    for column, column_type in (('known_instance_count', 'INTEGER'),
+                                ('unknown_instance_count', 'INTEGER'),
+                                ('star_statistics_json', 'TEXT'),
+                                ('text_content_zlib', 'BLOB')):
+        try:
+            conn.execute(f'ALTER TABLE scan_history ADD COLUMN {column} {column_type}')
+            conn.commit()
+        except sqlite3.OperationalError as e:
+            if "duplicate column name" not in str(e):
+                print(f"Warning: Could not add {column} column: {e}")
+    
+    # Rows saved with md5 hashes would never match a new lookup; rehash them from their stored text
+    if conn.execute('PRAGMA user_version').fetchone()[0] < TEXT_HASH_SCHEMA_VERSION:
+        try:
+            rehashed = _rehash_stored_texts(conn)
+            conn.execute(f'PRAGMA user_version = {TEXT_HASH_SCHEMA_VERSION}')
+            conn.commit()
+            if rehashed:
+                print(f"Rehashed {rehashed} scan history entries")
+        except Exception:
+            conn.rollback()
+            raise
+    
     conn.commit()
-    conn.close()
+
+def _rehash_stored_texts(conn: sqlite3.Connection) -> int:
+    """Recompute text_hash for every row with stored text (rows without text keep their hash). Returns the number of rows updated."""
+    rehashed = 0
+    scan_ids = [row['id'] for row in conn.execute('SELECT id FROM scan_history')]
+    for scan_id in scan_ids:
+        row = conn.execute(
+            'SELECT text_content, text_content_zlib FROM scan_history WHERE id = ?', (scan_id,)
+        ).fetchone()
+        text_content = row['text_content']
+        if text_content is None and row['text_content_zlib'] is not None:
+            text_content = zlib.decompress(row['text_content_zlib']).decode('utf-8')
+        if text_content is not None:
+            conn.execute('UPDATE scan_history SET text_hash = ? WHERE id = ?',
+                         (generate_text_hash(text_content), scan_id))
+            rehashed += 1
+    return rehashed
+
+def _dumps(data) -> str:
+    """Serialize a result column to JSON text, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+    return json.dumps(data, ensure_ascii=False)
+
+def _loads(json_text: str):
+    """Parse a stored JSON column, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(json_text)
+    return json.loads(json_text)
 
 def generate_text_hash(text_content: str) -> str:
     """Generate a hash for the text content to identify duplicates"""
-    # Normalize text by removing extra whitespace and converting to lowercase
-    normalized_text = ' '.join(text_content.lower().split())
-    return hashlib.md5(normalized_text.encode('utf-8')).hexdigest()
+    # Normalize text by removing extra whitespace and converting to lowercase.
+    # This is done window by window (each cut at whitespace, so no word is split)
+    # and fed straight into the hash, instead of building a normalized copy of
+    # the whole text; the digest equals hashing ' '.join(text.lower().split()).
+    text_hash = hashlib.blake2b(digest_size=16)
+    separator = b''
+    start = 0
+    while start < len(text_content):
+        end = start + TEXT_HASH_WINDOW
+        if end < len(text_content):
+            match = _WHITESPACE_RE.search(text_content, end)
+            end = match.start() if match else len(text_content)
+        words = text_content[start:end].lower().split()
+        if words:
+            text_hash.update(separator + ' '.join(words).encode('utf-8'))
+            separator = b' '
+        start = end
+    return text_hash.hexdigest()
 
-def save_scan_result(analysis_data: Dict, text_content: str, filename: Optional[str] = None) -> Optional[int]:
-    """Save scan result to database. Creates a new entry each time, allowing multiple analyses of the same text. Returns the scan ID."""
-    text_hash = generate_text_hash(text_content)
+def save_scan_result(analysis_data: Dict, text_content: str, filename: Optional[str] = None,
+                     text_hash: Optional[str] = None) -> Optional[int]:
+    """Save scan result to database. Creates a new entry each time, allowing multiple analyses of the same text. Returns the scan ID.
+    Pass text_hash when the caller already computed it (e.g. via check_if_text_analyzed) to skip rehashing."""
+    if text_hash is None:
+        text_hash = generate_text_hash(text_content)
+    
+    known_words = analysis_data.get('known_words', [])
+    unknown_words = analysis_data.get('unknown_words', [])
+    known_instance_count = analysis_data.get('known_word_count')
+    if known_instance_count is None:
+        known_instance_count = sum(item['count'] for item in known_words)
+    unknown_instance_count = analysis_data.get('unknown_word_count')
+    if unknown_instance_count is None:
+        unknown_instance_count = sum(item['count'] for item in unknown_words)
+    star_statistics = analysis_data.get('star_statistics')
     
     conn = get_db_connection()
     
@@ -83,36 +211,43 @@ def save_scan_result(analysis_data: Dict, text_content: str, filename: Optional[
         # Insert new scan result (allows multiple analyses of same text)
         cursor = conn.execute('''
             INSERT INTO scan_history (
-                text_hash, filename, text_content, text_length,
+                text_hash, filename, text_content_zlib, text_length,
                 comprehension_rate, difficulty_level, total_words, total_instances, total_processed_words,
                 known_words_count, unknown_words_count, ignored_words_count,
-                known_words_json, unknown_words_json, ignored_words_json, star_distribution_json
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                known_instance_count, unknown_instance_count,
+                known_words_json, unknown_words_json, ignored_words_json, star_distribution_json,
+                star_statistics_json
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         ''', (
             text_hash,
             filename,
-            text_content,
+            # Stored compressed; text_content stays NULL for new rows
+            zlib.compress(text_content.encode('utf-8')),
             len(text_content),
             analysis_data.get('comprehension_rate', 0.0),
             analysis_data.get('difficulty_level', 'Unknown'),
             analysis_data.get('total_words', 0),
             analysis_data.get('total_instances', 0),
             analysis_data.get('total_processed_words', 0),
-            len(analysis_data.get('known_words', [])),
-            len(analysis_data.get('unknown_words', [])),
+            len(known_words),
+            len(unknown_words),
             len(analysis_data.get('ignored_words', [])),
-            json.dumps(analysis_data.get('known_words', []), ensure_ascii=False),
-            json.dumps(analysis_data.get('unknown_words', []), ensure_ascii=False),
-            json.dumps(analysis_data.get('ignored_words', []), ensure_ascii=False),
-            json.dumps(analysis_data.get('star_distribution', {}), ensure_ascii=False)
+            known_instance_count,
+            unknown_instance_count,
+            _dumps(known_words),
+            _dumps(unknown_words),
+            _dumps(analysis_data.get('ignored_words', [])),
+            _dumps(analysis_data.get('star_distribution', {})),
+            _dumps(star_statistics) if star_statistics is not None else None
         ))
         
         scan_id = cursor.lastrowid
         conn.commit()
         return scan_id if scan_id is not None else 0
         
-    finally:
-        conn.close()
+    except Exception:
+        conn.rollback()
+        raise
 
 def get_scan_by_hash(text_hash: str) -> Optional[Dict]:
     """Get most recent scan result by text hash (since multiple analyses can exist for same text)"""
@@ -125,16 +260,35 @@ def get_scan_by_hash(text_hash: str) -> Optional[Dict]:
         ).fetchone()
         
         if row:
-            return dict(row)
+            scan_data = dict(row)
+            compressed_text = scan_data.pop('text_content_zlib')
+            if scan_data['text_content'] is None and compressed_text is not None:
+                scan_data['text_content'] = zlib.decompress(compressed_text).decode('utf-8')
+            return scan_data
         return None
         
-    finally:
-        conn.close()
+    except Exception:
+        conn.rollback()
+        raise
 
-def check_if_text_analyzed(text_content: str) -> Optional[Dict]:
-    """Check if text has been analyzed before - returns most recent analysis if found"""
-    text_hash = generate_text_hash(text_content)
-    return get_scan_by_hash(text_hash)
+def check_if_text_analyzed(text_content: str, text_hash: Optional[str] = None) -> Optional[Dict]:
+    """Check if text has been analyzed before - returns the most recent scan's id and created_at if found
+    (use get_scan_by_id for the full result)"""
+    if text_hash is None:
+        text_hash = generate_text_hash(text_content)
+    conn = get_db_connection()
+    
+    try:
+        row = conn.execute(
+            'SELECT id, created_at FROM scan_history WHERE text_hash = ? ORDER BY created_at DESC LIMIT 1',
+            (text_hash,)
+        ).fetchone()
+        
+        return dict(row) if row else None
+        
+    except Exception:
+        conn.rollback()
+        raise
 
 def get_scan_history(limit: int = 50) -> List[Dict]:
     """Get scan history ordered by creation date (newest first)"""
@@ -142,7 +296,7 @@ def get_scan_history(limit: int = 50) -> List[Dict]:
     
     try:
         rows = conn.execute('''
-            SELECT id, filename, text_length, created_at, comprehension_rate, 
+            SELECT id, filename, created_at, comprehension_rate, 
                    difficulty_level, total_words, known_words_count, 
                    unknown_words_count, ignored_words_count
             FROM scan_history 
@@ -152,32 +306,55 @@ def get_scan_history(limit: int = 50) -> List[Dict]:
         
         return [dict(row) for row in rows]
         
-    finally:
-        conn.close()
+    except Exception:
+        conn.rollback()
+        raise
+
+def _int_keys(mapping: Dict) -> Dict:
+    """Restore integer keys (star levels) that JSON turned into strings."""
+    return {int(key): value for key, value in mapping.items()}
+
+def _load_star_statistics(star_statistics_json: Optional[str]) -> Optional[Dict]:
+    """Parse stored three-category star statistics, or None for older rows."""
+    if not star_statistics_json:
+        return None
+    stats = _loads(star_statistics_json)
+    stats['combined_star_distribution'] = _int_keys(stats['combined_star_distribution'])
+    stats['star_breakdown'] = _int_keys(stats['star_breakdown'])
+    for category in stats['categories'].values():
+        category['star_counts'] = _int_keys(category['star_counts'])
+    return stats
 
 def get_scan_by_id(scan_id: int) -> Optional[Dict]:
-    """Get full scan result by ID"""
+    """Get full scan result by ID (everything except the stored source text)"""
     conn = get_db_connection()
     
     try:
-        row = conn.execute(
-            'SELECT * FROM scan_history WHERE id = ?',
-            (scan_id,)
-        ).fetchone()
+        row = conn.execute('''
+            SELECT id, text_hash, filename, text_length, created_at,
+                   comprehension_rate, difficulty_level, total_words, total_instances, total_processed_words,
+                   known_words_count, unknown_words_count, ignored_words_count,
+                   known_instance_count, unknown_instance_count,
+                   known_words_json, unknown_words_json, ignored_words_json,
+                   star_distribution_json, star_statistics_json
+            FROM scan_history WHERE id = ?
+        ''', (scan_id,)).fetchone()
         
         if row:
             scan_data = dict(row)
             # Parse JSON fields back to objects
-            scan_data['known_words'] = json.loads(scan_data['known_words_json'] or '[]')
-            scan_data['unknown_words'] = json.loads(scan_data['unknown_words_json'] or '[]')
-            scan_data['ignored_words'] = json.loads(scan_data['ignored_words_json'] or '[]')
-            scan_data['star_distribution'] = json.loads(scan_data['star_distribution_json'] or '{}')
+            scan_data['known_words'] = _loads(scan_data['known_words_json'] or '[]')
+            scan_data['unknown_words'] = _loads(scan_data['unknown_words_json'] or '[]')
+            scan_data['ignored_words'] = _loads(scan_data['ignored_words_json'] or '[]')
+            scan_data['star_distribution'] = _loads(scan_data['star_distribution_json'] or '{}')
+            scan_data['star_statistics'] = _load_star_statistics(scan_data['star_statistics_json'])
             
             return scan_data
         return None
         
-    finally:
-        conn.close()
+    except Exception:
+        conn.rollback()
+        raise
 
 def delete_scan(scan_id: int) -> bool:
     """Delete a scan from history"""
@@ -188,8 +365,9 @@ def delete_scan(scan_id: int) -> bool:
         conn.commit()
         return cursor.rowcount > 0
         
-    finally:
-        conn.close()
+    except Exception:
+        conn.rollback()
+        raise
 
 def get_progress_comparison(limit: int = 10) -> List[Dict]:
     """Get recent scans for progress comparison"""
@@ -207,8 +385,9 @@ def get_progress_comparison(limit: int = 10) -> List[Dict]:
         
         return [dict(row) for row in rows]
         
-    finally:
-        conn.close()
+    except Exception:
+        conn.rollback()
+        raise
 
 def get_scans_by_filename(filename: str) -> List[Dict]:
     """Get all scans for a specific filename"""
@@ -226,8 +405,17 @@ def get_scans_by_filename(filename: str) -> List[Dict]:
         
         return [dict(row) for row in rows]
         
-    finally:
-        conn.close()
+    except Exception:
+        conn.rollback()
+        raise
+
+def optimize_database():
+    """Let SQLite refresh query planner statistics (run at shutdown)."""
+    try:
+        get_db_connection().execute('PRAGMA optimize')
+    except sqlite3.Error as e:
+        print(f"Warning: Could not optimize database: {e}")
 
 # Initialize database when module is imported
-init_database()
\ No newline at end of file
+init_database()
+atexit.register(optimize_database)
\ No newline at end of file
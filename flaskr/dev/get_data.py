@@ -1,18 +1,33 @@
 # Objective: get all the user known words from Anki from their Note Type
 import requests
+from requests.adapters import HTTPAdapter
 import json
-import pickle
 import os
 import logging
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # optional speedup; fall back to the stdlib json module
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
+# Card IDs per cardsInfo request, so AnkiConnect never builds one giant response
+CARDS_INFO_BATCH_SIZE = 1000
+
 class AnkiDataManager:
     def __init__(self, cache_dir: str = "data"):
         self.cache_dir = cache_dir
         self.ensure_cache_dir()
+        # One keep-alive connection reused for every AnkiConnect call
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=1)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        # cache file path -> (mtime_ns, parsed cache data)
+        self._loaded_caches: Dict[str, Tuple[int, Dict[str, Any]]] = {}
         
     def ensure_cache_dir(self):
         """Create cache directory if it doesn't exist"""
@@ -23,10 +38,14 @@ class AnkiDataManager:
         """Invoke AnkiConnect API"""
         url = os.environ.get("ANKI_CONNECT_URL", "http://127.0.0.1:8765").rstrip("/")
         payload = {'action': action, 'version': version, 'params': params or {}}
-        response = requests.post(url, json=payload)
+        if orjson is not None:
+            response = self.session.post(url, data=orjson.dumps(payload),
+                                         headers={'Content-Type': 'application/json'})
+        else:
+            response = self.session.post(url, json=payload)
 
         if response.status_code == 200:
-            data = response.json()
+            data = orjson.loads(response.content) if orjson is not None else response.json()
             if data.get('error') is None:
                 return data
             else:
@@ -37,7 +56,7 @@ class AnkiDataManager:
             return None
 
     def get_cache_filename(self, note_type: str, field_name: str) -> tuple:
-        """Generate cache filenames for both JSON and pickle formats"""
+        """Generate cache filenames: the JSON cache and the legacy pickle copy (no longer written)"""
         safe_note = note_type.replace(" ", "_").replace(":", "_")
         safe_field = field_name.replace(" ", "_")
         base_name = f"{safe_note}_{safe_field}"
@@ -46,22 +65,31 @@ class AnkiDataManager:
         return json_file, pickle_file
 
     def load_cache(self, note_type: str, field_name: str) -> Dict[str, Any]:
-        """Load cached data with metadata"""
-        json_file, pickle_file = self.get_cache_filename(note_type, field_name)
+        """
+        Load cached data with metadata. The parsed data is reused while the
+        file's mtime is unchanged, so callers must treat it as read-only.
+        """
+        json_file, _ = self.get_cache_filename(note_type, field_name)
         
-        # Try pickle first (faster)
-        if os.path.exists(pickle_file):
-            try:
-                with open(pickle_file, 'rb') as f:
-                    return pickle.load(f)
-            except (pickle.UnpicklingError, EOFError, OSError) as exc:
-                logger.warning("Failed loading pickle cache %s: %s", pickle_file, exc)
+        try:
+            mtime = os.stat(json_file).st_mtime_ns
+        except OSError:
+            mtime = None
+            self._loaded_caches.pop(json_file, None)
         
-        # Fallback to JSON
-        if os.path.exists(json_file):
+        if mtime is not None:
+            cached = self._loaded_caches.get(json_file)
+            if cached and cached[0] == mtime:
+                return cached[1]
             try:
-                with open(json_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                if orjson is not None:
+                    with open(json_file, 'rb') as f:
+                        data = orjson.loads(f.read())
+                else:
+                    with open(json_file, 'r', encoding='utf-8') as f:
+                        data = json.load(f)
+                self._loaded_caches[json_file] = (mtime, data)
+                return data
             except (OSError, json.JSONDecodeError, ValueError, TypeError) as exc:
                 logger.warning("Failed loading JSON cache %s: %s", json_file, exc)
         
@@ -77,20 +105,25 @@ class AnkiDataManager:
         }
 
     def save_cache(self, data: Dict[str, Any], note_type: str, field_name: str):
-        """Save data to both JSON and pickle formats"""
+        """Save data to the JSON cache file (compact; orjson when installed)"""
         json_file, pickle_file = self.get_cache_filename(note_type, field_name)
         
         # Update metadata
         data['metadata']['last_updated'] = datetime.now().isoformat()
         data['metadata']['total_cards'] = len(data['cards'])
         
-        # Save as JSON (human readable)
-        with open(json_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        if orjson is not None:
+            with open(json_file, 'wb') as f:
+                f.write(orjson.dumps(data))
+        else:
+            with open(json_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+        
+        self._loaded_caches[json_file] = (os.stat(json_file).st_mtime_ns, data)
         
-        # Save as pickle (faster loading)
-        with open(pickle_file, 'wb') as f:
-            pickle.dump(data, f)
+        # A pickle copy from older versions would only go stale now
+        if os.path.exists(pickle_file):
+            os.remove(pickle_file)
 
     def get_modified_cards(self, note_type: str, last_check_time: Optional[str] = None) -> list:
         """Get cards modified since last check"""
@@ -113,8 +146,9 @@ class AnkiDataManager:
         """Update cache with incremental or full update"""
         print(f"Updating cache for {note_type} - {field_name}...")
         
-        # Load existing cache
+        # Load existing cache, copied since the loaded dict is shared until saved
         cache_data = self.load_cache(note_type, field_name)
+        cache_data = {'metadata': dict(cache_data['metadata']), 'cards': dict(cache_data['cards'])}
         
         # Determine what cards to fetch
         if force_full_update:
@@ -128,9 +162,11 @@ class AnkiDataManager:
                 return cache_data
             print(f"Found {len(card_ids)} modified cards to update...")
 
-        # Fetch card details
-        if card_ids:
-            cards_info_result = self.ankiConnectInvoke('cardsInfo', 6, {'cards': card_ids})
+        # Fetch card details in batches
+        changed = False
+        for start in range(0, len(card_ids), CARDS_INFO_BATCH_SIZE):
+            batch = card_ids[start:start + CARDS_INFO_BATCH_SIZE]
+            cards_info_result = self.ankiConnectInvoke('cardsInfo', 6, {'cards': batch})
             if not cards_info_result:
                 return cache_data
 
@@ -138,34 +174,52 @@ class AnkiDataManager:
             for card in cards_info_result['result']:
                 card_id = str(card['cardId'])
                 if field_name in card['fields']:
-                    cache_data['cards'][card_id] = {
+                    entry = {
                         'expression': card['fields'][field_name]['value'],
                         'note_id': card['note'],
                         'deck_name': card['deckName'],
                         'card_type': card['type'],
-                        'modified': card['mod'],
-                        'cached_at': datetime.now().isoformat()
+                        'modified': card['mod']
                     }
+                    cached = cache_data['cards'].get(card_id)
+                    if cached is not None and all(cached.get(key) == value for key, value in entry.items()):
+                        continue  # Returned again but unchanged
+                    entry['cached_at'] = datetime.now().isoformat()
+                    cache_data['cards'][card_id] = entry
+                    changed = True
+
+            # Drop this batch's full card payloads (every field) before requesting the next
+            del cards_info_result
+
+        # Rewriting the whole file is only worth it if a card actually changed
+        if not changed and not force_full_update:
+            print("No changes found, cache left as is.")
+            return cache_data
 
         # Save updated cache
         self.save_cache(cache_data, note_type, field_name)
         print(f"Cache updated! Total cards: {len(cache_data['cards'])}")
         return cache_data
 
-    def get_expressions(self, note_type: str, field_name: str, update_cache: bool = True) -> list:
-        """Get all expressions from cache, optionally updating first"""
-        if update_cache:
-            cache_data = self.update_card_cache(note_type, field_name)
+    def get_expressions_and_cache(self, note_type: str, field_name: str, update_cache: bool = False,
+                                  force_full_update: bool = False) -> Tuple[list, Dict[str, Any]]:
+        """Get all expressions together with the cache data they came from (loaded once)"""
+        if update_cache or force_full_update:
+            cache_data = self.update_card_cache(note_type, field_name, force_full_update=force_full_update)
         else:
             cache_data = self.load_cache(note_type, field_name)
         
-        expressions = []
-        for card_data in cache_data['cards'].values():
-            expr = card_data['expression'].strip()
-            if expr:  # Only add non-empty expressions
-                expressions.append(expr)
-        
-        return list(set(expressions))  # Remove duplicates
+        # Deduplicate while collecting, skipping empty expressions
+        expressions = list({
+            expr for card_data in cache_data['cards'].values()
+            if (expr := card_data['expression'].strip())
+        })
+        return expressions, cache_data
+
+    def get_expressions(self, note_type: str, field_name: str, update_cache: bool = True) -> list:
+        """Get all expressions from cache, optionally updating first"""
+        expressions, _ = self.get_expressions_and_cache(note_type, field_name, update_cache=update_cache)
+        return expressions
 
 def main():
     """Main function demonstrating the AnkiDataManager usage"""
@@ -229,10 +283,8 @@ def main():
         print(f"... and {len(expressions) - 10} more expressions")
     
     # Show cache location
-    json_file, pickle_file = manager.get_cache_filename(selectedNote, field)
-    print(f"\nCache saved to:")
-    print(f"  JSON: {json_file}")
-    print(f"  Pickle: {pickle_file}")
+    json_file, _ = manager.get_cache_filename(selectedNote, field)
+    print(f"\nCache saved to: {json_file}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
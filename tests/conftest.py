@@ -0,0 +1,152 @@
+import json
+
+import pytest
+import requests
+
+import flaskr
+from flaskr import create_app, database
+
+
+class FakeResponse:
+    def __init__(self, payload, status_code=200):
+        self.status_code = status_code
+        self.content = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+
+    def json(self):
+        return json.loads(self.content)
+
+    def raise_for_status(self):
+        if self.status_code != 200:
+            raise requests.exceptions.HTTPError(f"{self.status_code} Error")
+
+
+class FakeYomitan:
+    """
+    Stands in for the Yomitan API server (requests are routed here by install_post).
+    /tokenize splits text greedily into the known words (other characters
+    become one-character tokens) and /termEntries answers single words.
+    """
+
+    def __init__(self, words=(), frequencies=None, dictionary_forms=None):
+        self.words = sorted(words, key=len, reverse=True)
+        self.frequencies = frequencies or {}
+        self.dictionary_forms = dictionary_forms or {}
+        # Words /tokenize returns without headwords, so batches cannot resolve them
+        self.unresolved = set()
+        # Set to an exception instance or an HTTP status code to fail requests
+        self.failure = None
+        self.calls = []
+
+    def post(self, url, json=None, **kwargs):
+        endpoint = url.rsplit("/", 1)[-1]
+        self.calls.append((endpoint, json))
+        if isinstance(self.failure, Exception):
+            raise self.failure
+        if self.failure is not None:
+            return FakeResponse({"error": "unavailable"}, status_code=self.failure)
+        if endpoint == "termEntries":
+            return FakeResponse(self._term_entries(json["term"]))
+        return FakeResponse([{"content": [[self._option(token)] for token in self._tokenize(json["text"])]}])
+
+    def texts_tokenized(self):
+        return [body["text"] for endpoint, body in self.calls if endpoint == "tokenize"]
+
+    def _tokenize(self, text):
+        tokens = []
+        i = 0
+        while i < len(text):
+            word = next((w for w in self.words if text.startswith(w, i)), text[i])
+            if word.strip():
+                tokens.append(word)
+            i += len(word)
+        return tokens
+
+    def _frequency_items(self, word):
+        if word not in self.frequencies:
+            return []
+        return [{"frequency": self.frequencies[word], "dictionary": "JPDB"}]
+
+    def _option(self, token):
+        if token in self.unresolved:
+            return {"text": token}
+        headword = {
+            "term": self.dictionary_forms.get(token, token),
+            "reading": token,
+            "frequencies": self._frequency_items(token),
+        }
+        return {"text": token, "headwords": [[headword]]}
+
+    def _term_entries(self, term):
+        if term not in self.words:
+            return {"dictionaryEntries": []}
+        return {
+            "dictionaryEntries": [
+                {"headwords": [{"term": term, "reading": term}], "frequencies": self._frequency_items(term)}
+            ]
+        }
+
+
+def install_post(monkeypatch, post):
+    """Send the app's HTTP POST requests to post(url, json=None, **kwargs) instead."""
+    monkeypatch.setattr(requests.Session, "post", lambda session, url, **kwargs: post(url, **kwargs))
+
+
+@pytest.fixture()
+def data_dir(tmp_path, monkeypatch):
+    """Point data files, scan history and the per-process caches at an empty directory."""
+    data = tmp_path / "data"
+    data.mkdir()
+    monkeypatch.setattr(flaskr, "DATA_DIR", str(data))
+    monkeypatch.setattr(flaskr, "frequency_cache", None)
+    monkeypatch.setattr(flaskr, "frequency_cache_dirty", set())
+    monkeypatch.setattr(
+        flaskr, "ignored_words_state", {"words": None, "sorted": None, "dirty": False, "flush_timer": None}
+    )
+    monkeypatch.setattr(flaskr, "cache_metadata", {})
+    monkeypatch.setattr(flaskr, "cache_index", {"dir_mtime_ns": None, "by_key": {}})
+    monkeypatch.setattr(flaskr, "vocabulary_set_cache", {})
+    monkeypatch.setattr(database, "DATABASE_PATH", str(data / "scan_history.db"))
+    database.init_database()
+
+    yield data
+
+    timer = flaskr.ignored_words_state["flush_timer"]
+    if timer is not None:
+        timer.cancel()
+
+
+@pytest.fixture()
+def yomitan(monkeypatch):
+    """A FakeYomitan that knows the words of the /test-new-analysis sample text."""
+    fake = FakeYomitan(
+        words=["熱い", "お茶", "飲みました", "固い", "パン", "食べます"],
+        frequencies={"熱い": 1200, "お茶": 800, "固い": 9000, "パン": 2500},
+        dictionary_forms={"飲みました": "飲む", "食べます": "食べる"},
+    )
+    install_post(monkeypatch, fake.post)
+    return fake
+
+
+@pytest.fixture()
+def vocabulary_cache(data_dir):
+    """Write a small Anki vocabulary cache so analysis routes have a deck to use."""
+    cache = {
+        "metadata": {"note_type": "Test", "field_name": "Expr", "last_updated": "2024-01-01T00:00:00", "total_cards": 2},
+        "cards": {
+            "1": {"expression": "お茶", "mod": 1},
+            "2": {"expression": "パン", "mod": 1},
+        },
+    }
+    path = data_dir / "Test_Expr.json"
+    path.write_text(json.dumps(cache, ensure_ascii=False), encoding="utf-8")
+    return path
+
+
+@pytest.fixture()
+def isolated_app(data_dir):
+    return create_app({"TESTING": True, "SECRET_KEY": "test-secret"})
+
+
+@pytest.fixture()
+def isolated_client(isolated_app):
+    return isolated_app.test_client()
@@ -0,0 +1,65 @@
+import pytest
+
+from flaskr import database
+
+UNKNOWN_WORDS = ["熊", "狐", "狸", "鹿", "猿"]
+
+
+@pytest.fixture()
+def scan_id(data_dir):
+    analysis = {
+        "comprehension_rate": 40.0,
+        "difficulty_level": "5★ Expert",
+        "total_words": 8,
+        "total_instances": 20,
+        "total_processed_words": 19,
+        "known_words": [{"word": "猫", "count": 5, "rank": 100}, {"word": "犬", "count": 3, "rank": 2000}],
+        "unknown_words": [{"word": word, "count": 5 - i, "rank": 20000} for i, word in enumerate(UNKNOWN_WORDS)],
+        "ignored_words": [{"word": "の", "count": 1, "rank": None}],
+        "star_distribution": {5: 1, 4: 1, 2: 5, 0: 1},
+    }
+    return database.save_scan_result(analysis, "猫と犬と熊と狐と狸と鹿と猿の", filename="zoo.txt")
+
+
+def test_first_page_of_each_list_is_rendered(isolated_client, scan_id):
+    response = isolated_client.get(f"/cached_analysis/{scan_id}?page_size=2")
+
+    assert response.status_code == 200
+    html = response.get_data(as_text=True)
+    assert 'data-word="熊"' in html
+    assert 'data-word="狐"' in html
+    assert 'data-word="狸"' not in html
+    assert 'data-word="猫"' in html
+    assert 'data-word="の"' in html
+
+
+def test_later_pages_are_served_as_json(isolated_client, scan_id):
+    second = isolated_client.get(f"/cached_analysis/{scan_id}?category=unknown&page=1&page_size=2").get_json()
+    last = isolated_client.get(f"/cached_analysis/{scan_id}?category=unknown&page=2&page_size=2").get_json()
+
+    assert second["has_more"] is True
+    assert 'data-word="狸"' in second["html"] and 'data-word="鹿"' in second["html"]
+    assert 'data-word="熊"' not in second["html"]
+    assert last["has_more"] is False
+    assert 'data-word="猿"' in last["html"]
+    assert 'data-status="unknown"' in last["html"]
+
+
+def test_page_past_the_end_is_empty(isolated_client, scan_id):
+    page = isolated_client.get(f"/cached_analysis/{scan_id}?category=known&page=3&page_size=2").get_json()
+
+    assert page["has_more"] is False
+    assert "data-word" not in page["html"]
+
+
+@pytest.mark.parametrize("query", ["category=bogus&page=0", "category=unknown&page=-1", "page=0"])
+def test_invalid_page_requests_are_rejected(isolated_client, scan_id, query):
+    response = isolated_client.get(f"/cached_analysis/{scan_id}?{query}")
+
+    assert response.status_code == 400
+
+
+def test_missing_scan_redirects_home(isolated_client, data_dir):
+    response = isolated_client.get("/cached_analysis/999")
+
+    assert response.status_code == 302
@@ -0,0 +1,204 @@
+import hashlib
+import sqlite3
+
+import pytest
+
+from flaskr import database
+
+# scan_history as created by earlier versions of the app
+LEGACY_SCHEMA = """
+    CREATE TABLE scan_history (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        text_hash TEXT NOT NULL,
+        filename TEXT,
+        text_content TEXT,
+        text_length INTEGER,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        comprehension_rate REAL,
+        difficulty_level TEXT,
+        total_words INTEGER,
+        total_instances INTEGER,
+        total_processed_words INTEGER,
+        known_words_count INTEGER,
+        unknown_words_count INTEGER,
+        ignored_words_count INTEGER,
+        known_words_json TEXT,
+        unknown_words_json TEXT,
+        ignored_words_json TEXT,
+        star_distribution_json TEXT
+    )
+"""
+
+
+def _legacy_text_hash(text_content):
+    """generate_text_hash as it was before the switch to blake2b."""
+    return hashlib.md5(" ".join(text_content.lower().split()).encode("utf-8")).hexdigest()
+
+
+@pytest.fixture()
+def legacy_db(tmp_path, monkeypatch):
+    """A scan history database in the legacy schema, with one md5-hashed scan."""
+    db_path = tmp_path / "scan_history.db"
+    conn = sqlite3.connect(db_path)
+    conn.execute(LEGACY_SCHEMA)
+    conn.execute(
+        """INSERT INTO scan_history (text_hash, filename, text_content, text_length,
+                                     comprehension_rate, known_words_json, unknown_words_json)
+           VALUES (?, ?, ?, ?, ?, ?, ?)""",
+        (_legacy_text_hash("猫が  好き"), "old.txt", "猫が  好き", 6, 50.0, '[{"word": "猫", "count": 1}]', "[]"),
+    )
+    conn.commit()
+    conn.close()
+    monkeypatch.setattr(database, "DATABASE_PATH", str(db_path))
+    return db_path
+
+
+def test_generate_text_hash_normalizes_whitespace_and_case():
+    assert database.generate_text_hash("Neko  ga\nSUKI ") == database.generate_text_hash("neko ga suki")
+    assert database.generate_text_hash("neko ga suki") != database.generate_text_hash("nekoga suki")
+
+
+def test_generate_text_hash_windows_match_whole_text(monkeypatch):
+    text = "ねこ  が すき\n" * 50
+    whole = database.generate_text_hash(text)
+    monkeypatch.setattr(database, "TEXT_HASH_WINDOW", 7)
+    assert database.generate_text_hash(text) == whole
+
+
+def test_migration_rehashes_legacy_scans(legacy_db):
+    # md5 digests from before the switch to blake2b never match a new lookup
+    assert database.check_if_text_analyzed("猫が 好き") is None
+
+    database.init_database()
+
+    match = database.check_if_text_analyzed("猫が 好き")
+    assert match is not None
+    assert database.get_scan_by_id(match["id"])["filename"] == "old.txt"
+    assert database.get_db_connection().execute("PRAGMA user_version").fetchone()[0] == database.TEXT_HASH_SCHEMA_VERSION
+
+
+def test_migration_runs_once(legacy_db):
+    database.init_database()
+    conn = database.get_db_connection()
+    conn.execute("UPDATE scan_history SET text_hash = 'kept'")
+    conn.commit()
+
+    database.init_database()
+
+    assert conn.execute("SELECT text_hash FROM scan_history").fetchone()[0] == "kept"
+
+
+def _analysis(**overrides):
+    analysis = {
+        "comprehension_rate": 60.0,
+        "difficulty_level": "4★ Advanced",
+        "total_words": 5,
+        "total_instances": 10,
+        "total_processed_words": 9,
+        "known_words": [{"word": "猫", "count": 4, "rank": 100}, {"word": "犬", "count": 2, "rank": 2000}],
+        "unknown_words": [{"word": "熊", "count": 3, "rank": 20000}],
+        "ignored_words": [{"word": "の", "count": 1, "rank": None}],
+        "star_distribution": {5: 1, 4: 1, 2: 1},
+    }
+    analysis.update(overrides)
+    return analysis
+
+
+def test_migration_adds_instance_count_columns(legacy_db):
+    database.init_database()
+
+    columns = {row["name"] for row in database.get_db_connection().execute("PRAGMA table_info(scan_history)")}
+    assert {"known_instance_count", "unknown_instance_count"} <= columns
+
+    [legacy] = database.get_scan_history()
+    scan = database.get_scan_by_id(legacy["id"])
+    assert scan["known_instance_count"] is None
+    assert scan["unknown_instance_count"] is None
+
+
+def test_instance_counts_round_trip(data_dir):
+    scan_id = database.save_scan_result(_analysis(known_word_count=40, unknown_word_count=30), "猫と犬と熊")
+
+    scan = database.get_scan_by_id(scan_id)
+
+    assert scan["known_instance_count"] == 40
+    assert scan["unknown_instance_count"] == 30
+    assert scan["known_words_count"] == 2
+    assert scan["unknown_words_count"] == 1
+
+
+def test_instance_counts_default_to_word_list_totals(data_dir):
+    scan = database.get_scan_by_id(database.save_scan_result(_analysis(), "猫と犬と熊"))
+
+    assert scan["known_instance_count"] == 6
+    assert scan["unknown_instance_count"] == 3
+
+
+def _star_statistics():
+    star_counts = {5: 1, 4: 1, 3: 0, 2: 0, 1: 0, 0: 0}
+    return {
+        "categories": {
+            "known": {"star_counts": star_counts, "unique_words": 2, "total_instances": 6, "average_rating": 4.67},
+            "ignored": {"star_counts": {5: 0, 4: 0, 3: 0, 2: 0, 1: 0, 0: 1}, "unique_words": 1, "total_instances": 1, "average_rating": 0},
+            "unknown": {"star_counts": {5: 0, 4: 0, 3: 0, 2: 1, 1: 0, 0: 0}, "unique_words": 1, "total_instances": 3, "average_rating": 2.0},
+        },
+        "combined_star_distribution": {5: 1, 4: 1, 3: 0, 2: 1, 1: 0, 0: 1},
+        "total_unique_words": 4,
+        "total_word_instances": 10,
+        "star_breakdown": {stars: {"count": 1, "label": f"{stars}★", "color": "#000000"} for stars in range(6)},
+    }
+
+
+def test_star_statistics_round_trip_with_integer_keys(data_dir):
+    star_statistics = _star_statistics()
+    scan_id = database.save_scan_result(_analysis(star_statistics=star_statistics), "猫と犬と熊")
+
+    scan = database.get_scan_by_id(scan_id)
+
+    assert scan["star_statistics"] == star_statistics
+    assert scan["star_distribution"] == {"5": 1, "4": 1, "2": 1}
+
+
+def test_star_statistics_missing_for_older_rows(legacy_db):
+    database.init_database()
+    [legacy] = database.get_scan_history()
+
+    scan = database.get_scan_by_id(legacy["id"])
+
+    assert scan["star_statistics"] is None
+    assert scan["known_words"] == [{"word": "猫", "count": 1}]
+
+
+def test_text_content_is_stored_compressed(data_dir):
+    text = "吾輩は猫である。名前はまだ無い。\n" * 200
+    scan_id = database.save_scan_result(_analysis(), text, filename="neko.txt")
+
+    row = database.get_db_connection().execute(
+        "SELECT text_content, text_content_zlib, text_length FROM scan_history WHERE id = ?", (scan_id,)
+    ).fetchone()
+    assert row["text_content"] is None
+    assert len(row["text_content_zlib"]) < len(text.encode("utf-8"))
+    assert row["text_length"] == len(text)
+
+    scan = database.get_scan_by_hash(database.generate_text_hash(text))
+    assert scan["id"] == scan_id
+    assert scan["text_content"] == text
+    assert "text_content_zlib" not in scan
+
+
+def test_plain_text_content_of_older_rows_is_still_returned(legacy_db):
+    database.init_database()
+
+    scan = database.get_scan_by_hash(database.generate_text_hash("猫が 好き"))
+
+    assert scan["text_content"] == "猫が  好き"
+
+
+def test_request_connection_is_closed_with_the_app_context(isolated_client, data_dir):
+    conn = database.get_db_connection()
+
+    isolated_client.get("/scan_history")
+
+    with pytest.raises(sqlite3.ProgrammingError):
+        conn.execute("SELECT 1")
+    assert database.get_db_connection() is not conn
@@ -0,0 +1,98 @@
+import json
+import time
+
+import flaskr
+from conftest import FakeResponse, install_post
+
+
+def _term_entry_lookups(yomitan):
+    return [body["term"] for endpoint, body in yomitan.calls if endpoint == "termEntries"]
+
+
+def _frequency_batches(yomitan):
+    return [body["text"].split("\n") for endpoint, body in yomitan.calls if endpoint == "tokenize" and "\n" in body["text"]]
+
+
+def test_batch_resolves_ranks_and_misses_without_single_lookups(isolated_client, data_dir, yomitan, vocabulary_cache):
+    assert isolated_client.get("/test-new-analysis").status_code == 200
+
+    [batch] = _frequency_batches(yomitan)
+    assert set(batch) == {"熱い", "お茶", "飲みました", "固い", "パン", "食べます"}
+    assert _term_entry_lookups(yomitan) == []
+    assert flaskr.frequency_cache["熱い"] == {"rank": 1200, "source": "JPDB", "found": True}
+    # Resolved without frequency data: remembered as a miss
+    assert flaskr.frequency_cache["飲みました"] == {"found": False}
+
+    # Written by the background writer once the analysis has returned
+    cache_file = data_dir / "frequency_cache.json"
+    deadline = time.monotonic() + 5
+    while not cache_file.exists() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    saved = json.loads(cache_file.read_text(encoding="utf-8"))
+    assert saved["frequencies"]["パン"]["rank"] == 2500
+
+
+def test_cached_frequencies_skip_the_batch(isolated_client, yomitan, vocabulary_cache):
+    isolated_client.get("/test-new-analysis")
+    yomitan.calls.clear()
+
+    isolated_client.get("/test-new-analysis")
+
+    assert _frequency_batches(yomitan) == []
+    assert _term_entry_lookups(yomitan) == []
+
+
+def test_words_the_batch_cannot_answer_fall_back_to_term_entries(isolated_client, yomitan, vocabulary_cache):
+    yomitan.unresolved = {"パン", "食べます"}
+
+    isolated_client.get("/test-new-analysis")
+
+    assert sorted(_term_entry_lookups(yomitan)) == sorted(["パン", "食べます"])
+    assert flaskr.frequency_cache["パン"] == {"rank": 2500, "source": "JPDB", "found": True}
+    assert flaskr.frequency_cache["食べます"] == {"found": False}
+
+
+def test_failed_batch_falls_back_to_term_entries(isolated_client, yomitan, vocabulary_cache, monkeypatch):
+    healthy_post = yomitan.post
+
+    def post_failing_batches(url, json=None, **kwargs):
+        if url.endswith("/tokenize") and "\n" in json["text"]:
+            yomitan.calls.append(("tokenize", json))
+            return FakeResponse({"error": "unavailable"}, status_code=500)
+        return healthy_post(url, json=json, **kwargs)
+
+    install_post(monkeypatch, post_failing_batches)
+    isolated_client.get("/test-new-analysis")
+
+    assert len(_frequency_batches(yomitan)) == 1
+    assert sorted(_term_entry_lookups(yomitan)) == sorted(["熱い", "お茶", "飲みました", "固い", "パン", "食べます"])
+    assert flaskr.frequency_cache["固い"]["rank"] == 9000
+
+
+def test_option_level_frequencies_are_matched_by_headword_index(isolated_client, yomitan, vocabulary_cache, monkeypatch):
+    healthy_post = yomitan.post
+
+    def post_option_level_frequencies(url, json=None, **kwargs):
+        if not (url.endswith("/tokenize") and "\n" in json["text"]):
+            return healthy_post(url, json=json, **kwargs)
+        yomitan.calls.append(("tokenize", json))
+        content = []
+        for word in json["text"].split("\n"):
+            option = {
+                "text": word,
+                # Flat headword list; frequencies point at the matching headword by index
+                "headwords": [{"term": "別の語", "reading": "べつのご"}, {"term": word, "reading": word}],
+                "frequencies": [
+                    {"headwordIndex": 0, "frequency": 1, "dictionary": "Other"},
+                    {"headwordIndex": 1, "frequency": 4321, "dictionary": "JPDB"},
+                ],
+            }
+            content.append([option])
+        return FakeResponse([{"content": content}])
+
+    install_post(monkeypatch, post_option_level_frequencies)
+    isolated_client.get("/test-new-analysis")
+
+    assert _term_entry_lookups(yomitan) == []
+    assert flaskr.frequency_cache["お茶"] == {"rank": 4321, "source": "JPDB", "found": True}
@@ -0,0 +1,82 @@
+import json
+import time
+
+import flaskr
+
+
+def _ignored(client):
+    response = client.get("/ignored_words")
+    assert response.status_code == 200
+    return response.get_json()["ignored_words"]
+
+
+def _restart(monkeypatch):
+    """Forget the in-memory ignored words, as a fresh process would."""
+    timer = flaskr.ignored_words_state["flush_timer"]
+    if timer is not None:
+        timer.cancel()
+    monkeypatch.setattr(
+        flaskr, "ignored_words_state", {"words": None, "sorted": None, "dirty": False, "flush_timer": None}
+    )
+
+
+def test_log_is_replayed_over_the_snapshot(isolated_client, data_dir):
+    (data_dir / "ignored_words.json").write_text(json.dumps({"ignored_words": ["する", "ある"]}), encoding="utf-8")
+    (data_dir / "ignored_words.log").write_text(
+        '{"op": "add", "word": "いる"}\n'
+        '{"op": "remove", "word": "する"}\n'
+        '{"op": "add", "wo',  # cut off by a crash mid-write
+        encoding="utf-8",
+    )
+
+    assert _ignored(isolated_client) == ["ある", "いる"]
+
+
+def test_changes_are_appended_and_survive_a_restart(isolated_client, data_dir, monkeypatch):
+    isolated_client.post("/ignore_word", json={"word": "する"})
+    isolated_client.post("/ignore_word", json={"word": "ある"})
+    isolated_client.post("/unignore_word", json={"word": "する"})
+    # Repeating a change is a no-op and is not logged again
+    isolated_client.post("/ignore_word", json={"word": "ある"})
+
+    log_lines = (data_dir / "ignored_words.log").read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line) for line in log_lines] == [
+        {"op": "add", "word": "する"},
+        {"op": "add", "word": "ある"},
+        {"op": "remove", "word": "する"},
+    ]
+    assert not (data_dir / "ignored_words.json").exists()
+
+    _restart(monkeypatch)
+
+    assert _ignored(isolated_client) == ["ある"]
+
+
+def test_flush_writes_snapshot_and_truncates_log(isolated_client, data_dir, monkeypatch):
+    monkeypatch.setattr(flaskr, "IGNORED_WORDS_FLUSH_SECONDS", 0.01)
+
+    isolated_client.post("/ignore_word", json={"word": "いる"})
+
+    log_file = data_dir / "ignored_words.log"
+    deadline = time.monotonic() + 5
+    while log_file.read_text(encoding="utf-8") and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert log_file.read_text(encoding="utf-8") == ""
+    snapshot = json.loads((data_dir / "ignored_words.json").read_text(encoding="utf-8"))
+    assert snapshot["ignored_words"] == ["いる"]
+
+    _restart(monkeypatch)
+
+    assert _ignored(isolated_client) == ["いる"]
+
+
+def test_unreadable_snapshot_falls_back_to_the_log(isolated_client, data_dir):
+    (data_dir / "ignored_words.json").write_text("{not json", encoding="utf-8")
+    (data_dir / "ignored_words.log").write_text('{"op": "add", "word": "いる"}\n', encoding="utf-8")
+
+    assert _ignored(isolated_client) == ["いる"]
+
+    isolated_client.post("/ignore_word", json={"word": "ある"})
+
+    assert _ignored(isolated_client) == ["ある", "いる"]
@@ -0,0 +1,96 @@
+import threading
+import time
+
+import flaskr
+from flaskr import ProgressTracker
+
+
+def _later(action, delay=0.05):
+    timer = threading.Timer(delay, action)
+    timer.start()
+    return timer
+
+
+def test_wait_returns_at_once_when_payload_already_changed():
+    tracker = ProgressTracker()
+    tracker["job"] = {"progress": 10}
+
+    started = time.monotonic()
+    payload = tracker.wait_for_update("job", None, timeout=5)
+
+    assert payload == {"progress": 10}
+    assert time.monotonic() - started < 1
+
+
+def test_wait_wakes_on_update():
+    tracker = ProgressTracker()
+    first = tracker["job"] = {"progress": 10}
+
+    timer = _later(lambda: tracker.__setitem__("job", {"progress": 50}))
+    payload = tracker.wait_for_update("job", first, timeout=5)
+    timer.join()
+
+    assert payload == {"progress": 50}
+
+
+def test_wait_returns_none_when_entry_is_removed():
+    tracker = ProgressTracker()
+    first = tracker["job"] = {"progress": 10}
+
+    timer = _later(lambda: tracker.__delitem__("job"))
+    payload = tracker.wait_for_update("job", first, timeout=5)
+    timer.join()
+
+    assert payload is None
+
+
+def test_wait_times_out_with_unchanged_payload():
+    tracker = ProgressTracker()
+    first = tracker["job"] = {"progress": 10}
+
+    payload = tracker.wait_for_update("job", first, timeout=0.05)
+
+    assert payload is first
+
+
+def test_stale_entries_expire_when_a_new_entry_is_added(monkeypatch):
+    monkeypatch.setattr(flaskr, "PROGRESS_TTL_SECONDS", 0.05)
+    monkeypatch.setattr(flaskr, "progress_last_update", {"abandoned": 0.0})
+    tracker = ProgressTracker()
+    tracker["abandoned"] = {"stage": "complete"}
+    tracker["active"] = {"stage": "tokenizing"}
+
+    time.sleep(0.1)
+    tracker["active"] = {"stage": "analyzing"}  # updating an existing entry expires nothing
+    assert "abandoned" in tracker
+
+    tracker["new"] = {"stage": "starting"}
+
+    assert set(tracker) == {"active", "new"}
+    assert "abandoned" not in tracker.updated_at
+    assert "abandoned" not in flaskr.progress_last_update
+
+
+def test_waiting_stream_sees_expired_entry_as_removed(monkeypatch):
+    monkeypatch.setattr(flaskr, "PROGRESS_TTL_SECONDS", 0.05)
+    tracker = ProgressTracker()
+    first = tracker["abandoned"] = {"stage": "complete"}
+
+    time.sleep(0.1)
+    timer = _later(lambda: tracker.__setitem__("new", {"stage": "starting"}), delay=0)
+    payload = tracker.wait_for_update("abandoned", first, timeout=5)
+    timer.join()
+
+    assert payload is None
+
+
+def test_running_entries_do_not_expire(monkeypatch):
+    monkeypatch.setattr(flaskr, "PROGRESS_TTL_SECONDS", 0.05)
+    tracker = ProgressTracker()
+    tracker["slow"] = {"stage": "vocabulary_lookup"}
+    tracker["failed"] = {"stage": "error"}
+
+    time.sleep(0.1)
+    tracker["new"] = {"stage": "starting"}
+
+    assert set(tracker) == {"slow", "new"}
@@ -0,0 +1,25 @@
+import pytest
+
+from flaskr import rank_to_stars
+
+
+@pytest.mark.parametrize(
+    "rank, stars",
+    [
+        (None, 0),
+        (1, 5),
+        (1500, 5),
+        (1501, 4),
+        (5000, 4),
+        (5001, 3),
+        (15000, 3),
+        (15001, 2),
+        (30000, 2),
+        (30001, 1),
+        (60000, 1),
+        (60001, 0),
+        (250000, 0),
+    ],
+)
+def test_rank_to_stars_boundaries(rank, stars):
+    assert rank_to_stars(rank) == stars
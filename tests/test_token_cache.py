@@ -0,0 +1,99 @@
+import json
+
+import pytest
+import requests
+
+from conftest import FakeResponse, install_post
+from flaskr import create_app
+
+SAMPLE_TEXT = "熱いお茶を飲みました。固いパンを食べます。"
+
+
+def _token_cache_files(data_dir):
+    cache_dir = data_dir / "token_cache"
+    return sorted(cache_dir.glob("tok_*.json")) if cache_dir.exists() else []
+
+
+def test_repeat_analysis_reuses_cached_tokens(isolated_client, data_dir, yomitan, vocabulary_cache):
+    response = isolated_client.get("/test-new-analysis")
+    assert response.status_code == 200
+    assert yomitan.texts_tokenized()[0] == SAMPLE_TEXT
+
+    [cache_file] = _token_cache_files(data_dir)
+    assert "飲みました" in json.loads(cache_file.read_text(encoding="utf-8"))
+
+    yomitan.calls.clear()
+    response = isolated_client.get("/test-new-analysis")
+
+    assert response.status_code == 200
+    assert SAMPLE_TEXT not in yomitan.texts_tokenized()
+
+
+def test_chunk_size_change_invalidates_cached_tokens(data_dir, yomitan, vocabulary_cache):
+    create_app({"TESTING": True, "YOMITAN_CHUNK_SIZE": 300}).test_client().get("/test-new-analysis")
+    assert len(_token_cache_files(data_dir)) == 1
+
+    yomitan.calls.clear()
+    create_app({"TESTING": True, "YOMITAN_CHUNK_SIZE": 12}).test_client().get("/test-new-analysis")
+
+    assert "".join(yomitan.texts_tokenized()).startswith(SAMPLE_TEXT)
+    assert len(_token_cache_files(data_dir)) == 2
+
+
+def test_unreadable_token_cache_is_retokenized(isolated_client, data_dir, yomitan, vocabulary_cache):
+    isolated_client.get("/test-new-analysis")
+    [cache_file] = _token_cache_files(data_dir)
+    cache_file.write_text("[not json", encoding="utf-8")
+
+    yomitan.calls.clear()
+    isolated_client.get("/test-new-analysis")
+
+    assert SAMPLE_TEXT in yomitan.texts_tokenized()
+    assert "飲みました" in json.loads(cache_file.read_text(encoding="utf-8"))
+
+
+@pytest.mark.parametrize(
+    "failure, chunk_size",
+    [
+        (requests.exceptions.ConnectionError("Yomitan is down"), 300),
+        (requests.exceptions.Timeout("Yomitan timed out"), 300),
+        (503, 12),
+    ],
+)
+def test_outage_results_are_not_cached(data_dir, yomitan, vocabulary_cache, failure, chunk_size):
+    client = create_app({"TESTING": True, "YOMITAN_CHUNK_SIZE": chunk_size}).test_client()
+
+    yomitan.failure = failure
+    assert client.get("/test-new-analysis").status_code == 200
+    assert _token_cache_files(data_dir) == []
+
+    # Once Yomitan is back, the same text is tokenized for real and cached
+    yomitan.failure = None
+    yomitan.calls.clear()
+    assert client.get("/test-new-analysis").status_code == 200
+
+    assert yomitan.texts_tokenized()
+    [cache_file] = _token_cache_files(data_dir)
+    words = json.loads(cache_file.read_text(encoding="utf-8"))
+    assert "飲みました" in words
+    assert "飲" not in words
+
+
+@pytest.mark.parametrize("failure", [requests.exceptions.ConnectionError("dropped"), 503])
+def test_one_failed_chunk_is_not_cached(data_dir, yomitan, vocabulary_cache, monkeypatch, failure):
+    client = create_app({"TESTING": True, "YOMITAN_CHUNK_SIZE": 12}).test_client()
+    healthy_post = yomitan.post
+
+    def post_failing_second_chunk(url, json=None, **kwargs):
+        if url.endswith("/tokenize") and json["text"].startswith("固い"):
+            yomitan.calls.append(("tokenize", json))
+            if isinstance(failure, Exception):
+                raise failure
+            return FakeResponse({"error": "unavailable"}, status_code=failure)
+        return healthy_post(url, json=json, **kwargs)
+
+    install_post(monkeypatch, post_failing_second_chunk)
+    assert client.get("/test-new-analysis").status_code == 200
+
+    assert "固いパンを食べます。" in yomitan.texts_tokenized()
+    assert _token_cache_files(data_dir) == []